@@ -34,7 +34,8 @@ const DateRangeDropdownPage = () => {
     setHeaderText('Here is the Metrics Identians!!!');
     setLoading(true);
 try {
-  const result = await generateMetrics(fromDate, toDate, selectedOption);
+  // Show each stream's row as soon as it arrives
+  const result = await generateMetrics(fromDate, toDate, selectedOption, setOutput);
   console.log({fromDate});
   setOutput(result);
 } catch (error){
@@ -1,107 +1,182 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import pandas as pd
 from datetime import datetime
-from collections import defaultdict
-import requests
-from requests.auth import HTTPBasicAuth
 import json
 import os
+import contextvars
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed
+import re
+import html
+import hashlib
 from dotenv import load_dotenv
-from openai import OpenAI
+import summary_cache
+import shared_cache
+from llm_executor import LLMExecutor
+import holiday_index
+import business_calendar
+import jira_client
+import report_cache
+import jobs
+from circuit_breaker import CircuitOpenError
+import window_cache
+import epic_snapshot
+import telemetry
+from cache_warmer import CacheWarmer, CACHE_WARM_INTERVAL_SECONDS
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib encoder is used without it
+    orjson = None
 
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
-app = FastAPI()
+def create_openai_client():
+    # Imported and built on the first LLM call, so workers that never summarize
+    # (and /holidays or health checks) start without loading the openai package
+    from openai import OpenAI
+
+    # OPENAI_BASE_URL points the client at an OpenAI-compatible server such as fake_openai.py
+    return OpenAI(api_key=OPENAI_API_KEY, base_url=os.getenv("OPENAI_BASE_URL"))
+
+llm_executor = LLMExecutor(create_openai_client)
+
+def encode_json(content):
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    # Report payloads are plain dicts and lists, encoded in one pass with orjson when available
+    def render(self, content):
+        return encode_json(content)
+
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class DateRange(BaseModel):
     fromDate: str
     toDate: str
 
+class HolidayRequest(DateRange):
+    country: str = None
+    year: int = None
+
 class JiraRequest(BaseModel):
     selected_stream: str
     fromDate: str = None
     toDate: str = None
+    # Seconds an "All" report may take; streams still running are returned as pending
+    latencyBudget: float = None
 
 def get_holiday_list(from_date, to_date):
-    def sort_holidays_by_month(from_date, to_date):
-        # Read the Excel file
-        df = pd.read_excel("PingHolidayList.xlsx")
-
-        # Ensure proper column names
-        df.columns = ['Country', 'Holiday', 'Date']
-
-        # Forward-fill empty country cells with the previous country
-        df['Country'] = df['Country'].ffill()
-
-        # Convert the 'Date' column to datetime (accounting for the specific format)
-        df['Date'] = pd.to_datetime(df['Date'], format='%A, %B %d', errors='coerce')
-
-        # Drop rows where 'Date' could not be parsed
-        df = df.dropna(subset=['Date'])
-
-        # Parse the from_date and to_date as full dates
-        from_date = pd.to_datetime(from_date, format='%Y-%m-%d')
-        to_date = pd.to_datetime(to_date, format='%Y-%m-%d')
-        
-        # Extract month and day for comparison
-        df['Month-Day'] = df['Date'].dt.strftime('%m-%d')
-        df['Month-Day'] = pd.to_datetime(df['Month-Day'], format='%m-%d')
-        
-        from_month_day = from_date.strftime('%m-%d')
-        to_month_day = to_date.strftime('%m-%d')
-        
-        from_month_day = pd.to_datetime(from_month_day, format='%m-%d')
-        to_month_day = pd.to_datetime(to_month_day, format='%m-%d')
-        
-        if from_month_day > to_month_day:  # Handle year wraparound (e.g., Oct 01 to Feb 15)
-            df = df[(df['Month-Day'] >= from_month_day) | (df['Month-Day'] <= to_month_day)]
+    # Generate and print the sorted holiday list
+    try:
+        # Parsed holidays come from the in-memory index instead of re-reading the workbook
+        index = holiday_index.get_holiday_index()
+
+        # The result only depends on the month and day of each bound
+        cache_key = (from_date[5:], to_date[5:])
+        # A single read, since another request may clear the cache between a check and a lookup
+        result = index.query_cache.get(cache_key)
+        if result is None:
+            telemetry.cache_requests.inc("holidays", "miss")
+            result = index.between(from_date, to_date)
+            if len(index.query_cache) >= holiday_index.QUERY_CACHE_SIZE:
+                index.query_cache.clear()
+            index.query_cache[cache_key] = result
         else:
-            df = df[(df['Month-Day'] >= from_month_day) & (df['Month-Day'] <= to_month_day)]
-
-        # Extract the month for sorting
-        df['Month'] = df['Date'].dt.month
-
-        # Sort by month and then by date
-        sorted_df = df.sort_values(by=['Month', 'Month-Day'])
-
-        # Group holidays by date and consolidate countries for the same holiday
-        holidays_by_month = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-        for _, row in sorted_df.iterrows():
-            month_name = row['Date'].strftime('%B')
-            date_str = row['Date'].strftime('%B %d')
-            holidays_by_month[month_name][date_str][row['Holiday']].append(row['Country'])
-
-        # Format the output for each month
-        formatted_holidays = {"HOLIDAYS": []}
-        for month, dates in holidays_by_month.items():
-            for date, holidays in dates.items():
-                holiday_entries = []
-                for holiday_name, countries in holidays.items():
-                    country_list = ', '.join(sorted(set(countries)))
-                    holiday_entries.append(f"{holiday_name} ({country_list})")
-                formatted_holidays["HOLIDAYS"].append(f"{date} | {', '.join(holiday_entries)}")
-
-        if not formatted_holidays["HOLIDAYS"]:
-            return []
-
-        return formatted_holidays["HOLIDAYS"]
+            telemetry.cache_requests.inc("holidays", "hit")
+        return result
+    except Exception as e:
+        return f"Error processing the file: {e}"
 
-    # Generate and print the sorted holiday list
+def get_holiday_entries(from_date, to_date, country=None, year=None):
+    # Structured, year-aware entries resolved from the index's per-country posting lists
     try:
-        sorted_holidays = sort_holidays_by_month(from_date, to_date)
-        return json.dumps(sorted_holidays)
+        return holiday_index.get_holiday_index().lookup(from_date, to_date, country, year)
     except Exception as e:
         return f"Error processing the file: {e}"
     
 
 
-def metric(selected_stream, fromDate = None, toDate = None):
+STREAMS = ["Identity Trust", "P1AS", "iOPS", "MT SaaS", "Software", "AI / Analytics Data Platform", "AIC"]
+# Jira filter for each product stream, shared by every report's JQL
+STREAM_JQL = {
+    "Identity Trust": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA))',
+    "P1AS": 'and Project in (PDO, PP)',
+    "iOPS": 'and project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB)',
+    "MT SaaS": 'and (filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci"))',
+    "Software": 'and project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM)',
+    "AI / Analytics Data Platform": 'and project in (IGA, ANALYTICS, AI)',
+    "AIC": 'and project in (FRAAS)',
+    # "DEFAULT": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA) or Project in (PDO, PP) or project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB) or filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci") or project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM) or project in (IGA) or project in (FRAAS))'
+}
+# Streams of an "All" report are computed side by side on this pool
+STREAM_WORKERS = int(os.getenv("STREAM_WORKERS", "8"))
+stream_pool = ThreadPoolExecutor(max_workers=STREAM_WORKERS, thread_name_prefix="stream")
+
+def parts_kind(kind, issues):
+    # Parts computed from epics the combined report fetched and filtered itself are
+    # cached apart from the report's own, since that filter need not match its query
+    return kind if issues is None else f"report:{kind}"
+
+def submit_streams(kind, compute_stream, from_date, to_date):
+    # Each stream's part of an "All" report is cached on its own, so a stream that
+    # misses the budget keeps running and is ready when the report is requested again.
+    # Only fresh parts are reused; an expired one is recomputed rather than served
+    # stale, and the "All" result is stored as old as the oldest part it reused.
+    def run(stream):
+        key = (kind, "All", from_date, to_date, stream)
+        result = report_cache.get(key)
+        telemetry.cache_requests.inc("reports", "miss" if result is None else "hit")
+        if result is None:
+            result = report_cache.refresh(key, lambda: compute_stream(stream))
+        jobs.record("streams")
+        return result
+
+    return {stream: stream_pool.submit(contextvars.copy_context().run, run, stream) for stream in STREAMS}
+
+def collect_streams(kind, compute_stream, from_date, to_date, latency_budget=None):
+    futures = submit_streams(kind, compute_stream, from_date, to_date)
+    wait(futures.values(), timeout=latency_budget)
+
+    results, pending, errors = {}, [], {}
+    for stream, future in futures.items():
+        if not future.done():
+            pending.append(stream)
+        elif future.exception() is not None:
+            if latency_budget is None:
+                raise future.exception()
+            errors[stream] = str(future.exception())
+        else:
+            results[stream] = future.result()
+    return results, pending, errors
+
+def partial_report(report, pending, errors):
+    # Shape of an "All" report requested with a latency budget
+    return {"results": report, "pending": pending, "errors": errors, "complete": not pending and not errors}
+
+def fetch_stream(report, stream, jql):
+    # One stream's Jira crawl for a report, timed per stream
+    with telemetry.stream_fetch_seconds.time(report, stream):
+        return jira_client.fetch_all_issues(jql)
+
+# Created/resolved/in-progress/closed dates per epic, shared by all workers
+CHANGELOG_CACHE_TTL_SECONDS = float(os.getenv("CHANGELOG_CACHE_TTL_SECONDS", str(7 * 86400)))
+changelog_dates = shared_cache.TieredCache("changelog_dates", CHANGELOG_CACHE_TTL_SECONDS, max_entries=50000, local_entries=5000)
+
+def metric(selected_stream, fromDate = None, toDate = None, latency_budget = None, incremental = False, issues = None, records = False):
+    # incremental=True yields (stream, statistics or exception) as each stream finishes;
+    # issues maps each stream to epics the caller already fetched from Jira;
+    # records=True returns the stream's extracted epics, freshly crawled, instead of their statistics
 
     def calculate_epic_statistics(data, selected_stream):
+        import numpy as np
+
         # Initialize counters and totals
         total_epics = len(data)
         completed = 0
@@ -133,15 +208,28 @@ def metric(selected_stream, fromDate = None, toDate = None):
             days_in_progress_to_closed = epic.get('Days from In Progress to Closed', 0)
             total_days_in_progress_to_closed += days_in_progress_to_closed if days_in_progress_to_closed is not None else 0
 
+        # Business-day age and fix time for every epic in one vectorized pass (missing dates count as 0)
+        calendar = business_calendar.get_business_calendar()
+        business_days_created_to_resolved = calendar.business_days(
+            [epic.get('Created_Date') for epic in data], [epic.get('Resolved_Date') for epic in data])
+        business_days_in_progress_to_closed = calendar.business_days(
+            [epic.get('InProgress_Date') for epic in data], [epic.get('Closed_Date') for epic in data])
+        total_business_days_created_to_resolved = float(np.nansum(business_days_created_to_resolved))
+        total_business_days_in_progress_to_closed = float(np.nansum(business_days_in_progress_to_closed))
+
         # Calculate statistics
         percent_delivery_commitment = (committed_or_stretch / total_epics) * 100 if total_epics > 0 else 0
         avg_age_of_epic = total_days_created_to_resolved / total_epics if total_epics > 0 else 0
         avg_time_for_fixing_epic = total_days_in_progress_to_closed / total_epics if total_epics > 0 else 0
+        avg_business_age_of_epic = total_business_days_created_to_resolved / total_epics if total_epics > 0 else 0
+        avg_business_time_for_fixing_epic = total_business_days_in_progress_to_closed / total_epics if total_epics > 0 else 0
 
         # Format results to two decimal points
         percent_delivery_commitment = round(percent_delivery_commitment, 2)
         avg_age_of_epic = round(avg_age_of_epic, 2)
         avg_time_for_fixing_epic = round(avg_time_for_fixing_epic, 2)
+        avg_business_age_of_epic = round(avg_business_age_of_epic, 2)
+        avg_business_time_for_fixing_epic = round(avg_business_time_for_fixing_epic, 2)
         # Store results in the specified format
         results = {
             selected_stream: [
@@ -153,25 +241,18 @@ def metric(selected_stream, fromDate = None, toDate = None):
                 not_started,
                 percent_delivery_commitment,
                 avg_age_of_epic,
-                avg_time_for_fixing_epic
+                avg_time_for_fixing_epic,
+                avg_business_age_of_epic,
+                avg_business_time_for_fixing_epic
             ]
         }
 
         return results
 
-    def append_jql(selected_stream, from_date=None, to_date=None):
+    def append_jql(selected_stream, from_date=None, to_date=None, window=None):
         base_jql = 'type in (Epic)'
         
-        streams = {
-            "Identity Trust": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA))',
-            "P1AS": 'and Project in (PDO, PP)',
-            "iOPS": 'and project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB)',
-            "MT SaaS": 'and (filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci"))',
-            "Software": 'and project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM)',
-            "AI / Analytics Data Platform": 'and project in (IGA, ANALYTICS, AI)',
-            "AIC": 'and project in (FRAAS)',
-            # "DEFAULT": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA) or Project in (PDO, PP) or project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB) or filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci") or project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM) or project in (IGA) or project in (FRAAS))'
-        }
+        streams = STREAM_JQL
         
         if selected_stream in streams:
             jql = base_jql + ' ' + streams[selected_stream]
@@ -188,6 +269,10 @@ def metric(selected_stream, fromDate = None, toDate = None):
             date_condition2 = f' and resolutiondate <= "{to_date} 00:00"'
             jql += date_condition2
 
+        if window:
+            # Half-open minute interval, so adjacent windows never overlap
+            jql += f' and resolutiondate >= "{window[0]}" and resolutiondate < "{window[1]}"'
+
         completed = False
         if completed:
             jql+= f' and ("On-Track[Dropdown]" = "Blue (Complete)" or "On-Track (migrated)" = "Blue (Complete)" or status in (Done, Resolved, Closed))'
@@ -200,7 +285,7 @@ def metric(selected_stream, fromDate = None, toDate = None):
         
         return jql
 
-    def fetch_jira_issue_data(jira_id):
+    def fetch_jira_issue_data(jira_id, updated=None):
         def extract_filed_data(fields, changelog):
             on_deck_date = None
             closed_date = None
@@ -244,21 +329,20 @@ def metric(selected_stream, fromDate = None, toDate = None):
 
             return issue_data
 
-        url = f"https://pingidentity.atlassian.net/rest/api/3/issue/{jira_id}?expand=changelog"
-        payload = {}
-
-        jira_token = "ATATT3xFfGF0ndxink9QUjPTdQruBLLfLdrqtf28sIc3xoG9EyN2Jg7xhQFPzDvzfZNYL82Qa2oWqfZQ4qKUGYVCdy4eAkHh1chHxzVCVX-yWYbJFP-bybz_pkEDBl7xfITGpb4lgcf4UhWjbxAhmS3nYzrVS9FEb-zb_BQTLiDxAIhroWSymsI=1BC0A3B3"
-        auth = HTTPBasicAuth('msomani@pingidentity.com', jira_token)
-        headers = {
-            'Content-Type': 'application/json',
-        }
+        # Any change to the epic (a status transition, a new resolution) bumps its
+        # updated timestamp, so the one from the search result is part of the key
+        cache_key = f"{jira_id}|{updated}"
+        issue_data = changelog_dates.get(cache_key)
+        if issue_data is not None:
+            return issue_data
 
-        response = requests.request("GET", url, headers=headers, data=payload, auth=auth)
-        result = response.json()
+        result = jira_client.fetch_issue_with_changelog(jira_id)
         fields = result.get("fields", {})
         changelog = result.get("changelog", {})
 
-        return extract_filed_data(fields, changelog)
+        issue_data = extract_filed_data(fields, changelog)
+        changelog_dates.put(cache_key, issue_data)
+        return issue_data
     
     def extract_issue_data(issues):
         extracted_data = []
@@ -313,116 +397,168 @@ def metric(selected_stream, fromDate = None, toDate = None):
             }
 
             # Fetch additional data for the issue
-            additional_data = fetch_jira_issue_data(issue_id)
+            additional_data = fetch_jira_issue_data(issue_id, fields.get("updated"))
             issue_data.update(additional_data)
 
             extracted_data.append(issue_data)
 
         return extracted_data
-    
-    def fetch_issues_with_pagination(jql, start_at=0, max_results=50):
-        url = "https://pingidentity.atlassian.net/rest/api/3/search?_r=1734441761716"
-        jira_token = "ATATT3xFfGF0ndxink9QUjPTdQruBLLfLdrqtf28sIc3xoG9EyN2Jg7xhQFPzDvzfZNYL82Qa2oWqfZQ4qKUGYVCdy4eAkHh1chHxzVCVX-yWYbJFP-bybz_pkEDBl7xfITGpb4lgcf4UhWjbxAhmS3nYzrVS9FEb-zb_BQTLiDxAIhroWSymsI=1BC0A3B3"
-        auth = HTTPBasicAuth('msomani@pingidentity.com', jira_token)
-
-        payload = json.dumps({
-            "jql": jql,
-            "validateQuery": "warn",
-            "startAt": start_at,
-            "maxResults": max_results,
-            "fields": [
-                "customfield_10078",
-                "customfield_11020",
-                "customfield_11025",
-                "customfield_10112",
-                "summary",
-                "customfield_10262",
-                "status",
-                "customfield_10256",
-                "customfield_10241",
-                "customfield_10100",
-                "customfield_11291",
-                "customfield_11084",
-                "customfield_11404",
-                "customfield_11085"
-            ],
-            "expand": [
-                "renderedFields"
-            ]
-        })
-
-        headers = {
-            'Content-Type': 'application/json'
-        }
 
-        response = requests.post(url, headers=headers, data=payload, auth=auth)
-        result = response.json()
-        return result.get("issues", []), result.get("total", 0)
+    def fetch_issues_data(selected_stream):
+        if issues is not None:
+            return extract_issue_data(issues.get(selected_stream, []))
+        if not fromDate and not toDate:
+            with telemetry.stream_fetch_seconds.time("metrics", selected_stream):
+                return extract_issue_data(jira_client.fetch_all_issues(append_jql(selected_stream)))
+
+        def fetch_window(start, end):
+            issues = jira_client.fetch_all_issues(append_jql(selected_stream, window=(start, end)))
+            return [(issue.get("fields", {}).get("resolutiondate"), issue.get("key", ""), data)
+                    for issue, data in zip(issues, extract_issue_data(issues))]
+
+        # Same bounds as the date conditions: from 00:00 through the 00:00 minute of toDate.
+        # Only the parts of the window no cached segment covers are fetched, changelogs included.
+        start = f"{fromDate} 00:00" if fromDate else "1970-01-01 00:00"
+        end = window_cache.format_minute(window_cache.to_minute(f"{toDate} 00:00") + 1) if toDate else "2100-01-01 00:00"
+        with telemetry.stream_fetch_seconds.time("metrics", selected_stream):
+            return window_cache.epic_windows.query(append_jql(selected_stream), start, end, fetch_window)
     
-    if selected_stream == "All":
-        stream = ["Identity Trust", "P1AS", "iOPS", "MT SaaS", "Software", "AI / Analytics Data Platform", "AIC"]
-        metrics = {}
-
-        for selected_stream in stream:
-            jql = append_jql(selected_stream, fromDate, toDate)
+    def snapshot_metrics(selected_stream):
+        # Statistics from the epic snapshot published by the sync process, when it covers the window
+        if issues is not None or not fromDate:
+            return None
+        snapshot = epic_snapshot.get_epic_snapshot()
+        if snapshot is None:
+            return None
+        start = window_cache.to_minute(f"{fromDate} 00:00")
+        end = window_cache.to_minute(f"{toDate} 00:00") + 1 if toDate else snapshot.end
+        stats = snapshot.statistics(selected_stream, start, end, business_calendar.get_business_calendar())
+        telemetry.cache_requests.inc("epic_snapshot", "miss" if stats is None else "hit")
+        return stats
+
+    def stream_metrics(selected_stream):
+        stats = snapshot_metrics(selected_stream)
+        if stats is not None:
+            return stats
 
-            all_issues = []
-            start_at = 0
-            max_results = 50
-            total_issues = 1  # Initialize with a non-zero value to enter the loop
+        # Process and format all fetched issues
+        issues_data = fetch_issues_data(selected_stream)
 
-            while start_at < total_issues:
-                issues, total_issues = fetch_issues_with_pagination(jql, start_at, max_results)
-                all_issues.extend(issues)
-                start_at += max_results
+        if issues_data:
+            return list(calculate_epic_statistics(issues_data, selected_stream).values())[0]
+        return []
+
+    def cached_stream(selected_stream):
+        # A single stream reads the same entry as its JSON report
+        key = ("metrics", selected_stream, fromDate, toDate)
+        report = report_cache.get(key)
+        telemetry.cache_requests.inc("reports", "miss" if report is None else "hit")
+        if report is None:
+            report = report_cache.refresh(key, lambda: metric(selected_stream, fromDate, toDate))
+        return report.get(selected_stream, [])
+
+    def completed_streams():
+        if selected_stream == "All":
+            futures = submit_streams(parts_kind("metrics", issues), stream_metrics, fromDate, toDate)
+        else:
+            compute = stream_metrics if issues is not None else cached_stream
+            futures = {selected_stream: stream_pool.submit(contextvars.copy_context().run, compute, selected_stream)}
+        streams = {future: stream for stream, future in futures.items()}
+        for future in as_completed(streams):
+            yield streams[future], future.exception() or future.result()
 
-            # Process and format all fetched issues
-            issues_data = extract_issue_data(all_issues)
+    if records:
+        # The epic snapshot sync publishes what Jira holds now, so it crawls past the
+        # window cache, whose segments can be up to its TTL old
+        with telemetry.stream_fetch_seconds.time("metrics", selected_stream):
+            return extract_issue_data(jira_client.fetch_all_issues(append_jql(selected_stream, fromDate, toDate)))
 
-            if issues_data:
-                metrics[selected_stream] = metrics[selected_stream] = list(calculate_epic_statistics(issues_data, selected_stream).values())[0]
-            else:
-                metrics[selected_stream] = []
+    if incremental:
+        return completed_streams()
 
-        return json.dumps(metrics)
+    if selected_stream == "All":
+        metrics, pending, errors = collect_streams(parts_kind("metrics", issues), stream_metrics, fromDate, toDate, latency_budget)
+        if latency_budget is not None:
+            return partial_report(metrics, pending, errors)
+        return {stream: metrics[stream] for stream in STREAMS}
     else:
-        # Main logic to fetch all issues
-        jql = append_jql(selected_stream, fromDate, toDate)
-
-        all_issues = []
-        start_at = 0
-        max_results = 50
-        total_issues = 1  # Initialize with a non-zero value to enter the loop
-
-        while start_at < total_issues:
-            issues, total_issues = fetch_issues_with_pagination(jql, start_at, max_results)
-            all_issues.extend(issues)
-            start_at += max_results
+        stats = snapshot_metrics(selected_stream)
+        if stats is not None:
+            return {selected_stream: stats} if stats else {}
 
+        # Main logic to fetch all issues
         # print(len(all_issues))
         # Process and format all fetched issues
-        issues_data = extract_issue_data(all_issues)
+        issues_data = fetch_issues_data(selected_stream)
         metrics = {}
         if issues_data:
             metrics = calculate_epic_statistics(issues_data, selected_stream)
-        return json.dumps(metrics)
+        return metrics
     
 
-def fetch_jira_issues(selected_stream, fromDate = None, toDate = None):
+# Rendered On_Track_Comment HTML is reduced to plain text before it reaches a prompt
+ON_TRACK_COMMENT_MAX_CHARS = int(os.getenv("ON_TRACK_COMMENT_MAX_CHARS", "600"))
+COMMENT_TEXT_CACHE_SIZE = 5000
+HTML_BLOCK_END = re.compile(r"<br\s*/?>|</(?:p|li|div|tr|h[1-6]|blockquote|pre)\s*>", re.IGNORECASE)
+HTML_TAG = re.compile(r"<[^>]*>")
+# Least recently used entries are evicted first; prompts are built on several stream threads
+comment_text_cache = OrderedDict()
+comment_text_lock = threading.Lock()
+
+def html_to_text(issue_key, rendered):
+    if not rendered:
+        return ""
+
+    cache_key = (issue_key, hashlib.sha1(rendered.encode("utf-8")).hexdigest())
+    with comment_text_lock:
+        text = comment_text_cache.get(cache_key)
+        if text is not None:
+            comment_text_cache.move_to_end(cache_key)
+            return text
+
+    # Block boundaries become line breaks, every other tag is dropped
+    plain = html.unescape(HTML_TAG.sub("", HTML_BLOCK_END.sub("\n", rendered)))
+    lines = [" ".join(line.split()) for line in plain.splitlines()]
+    text = ""
+    for line in lines:
+        if not line:
+            continue
+        if text:
+            text += " " if text[-1] in ".!?:;," else "; "
+        text += line
+
+    if len(text) > ON_TRACK_COMMENT_MAX_CHARS:
+        text = text[:ON_TRACK_COMMENT_MAX_CHARS].rsplit(" ", 1)[0] + "..."
+
+    with comment_text_lock:
+        comment_text_cache[cache_key] = text
+        while len(comment_text_cache) > COMMENT_TEXT_CACHE_SIZE:
+            comment_text_cache.popitem(last=False)
+    return text
+
+
+# Columns sent to the LLM for each issue, in prompt order
+PROMPT_ISSUE_FIELDS = ["IssueId", "Summary", "Product", "Track", "On_Track_Comment", "OnTrack_Status", "Release_Type"]
+
+def format_prompt_value(value):
+    if value is None:
+        return ""
+    # Keep each issue on one line and the delimiter unambiguous
+    return " ".join(str(value).split()).replace("|", "/")
+
+def create_custom_issue_string_for_prompt(selected_stream, issues):
+    # One header row followed by one pipe-delimited row per issue
+    rows = [f"{selected_stream}:", "", "|".join(PROMPT_ISSUE_FIELDS)]
+    rows.extend("|".join(format_prompt_value(issue[field]) for field in PROMPT_ISSUE_FIELDS) for issue in issues)
+    return "\n".join(rows) + "\n\n"
+
+
+def fetch_jira_issues(selected_stream, fromDate = None, toDate = None, latency_budget = None, issues = None):
 
     def append_jql(selected_stream, from_date=None, to_date=None):
         base_jql = 'type in (Epic)'
         
-        streams = {
-            "Identity Trust": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA))',
-            "P1AS": 'and Project in (PDO, PP)',
-            "iOPS": 'and project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB)',
-            "MT SaaS": 'and (filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci"))',
-            "Software": 'and project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM)',
-            "AI / Analytics Data Platform": 'and project in (IGA, ANALYTICS, AI)',
-            "AIC": 'and project in (FRAAS)',
-            # "DEFAULT": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA) or Project in (PDO, PP) or project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB) or filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci") or project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM) or project in (IGA) or project in (FRAAS))'
-        }
+        streams = STREAM_JQL
         
         if selected_stream in streams:
             jql = base_jql + ' ' + streams[selected_stream]
@@ -511,6 +647,12 @@ def fetch_jira_issues(selected_stream, fromDate = None, toDate = None):
 
     #     return extract_filed_data(fields, changelog)
     
+    def fetch_stream_issues(selected_stream):
+        # Epics the combined report already fetched skip the Jira crawl
+        if issues is not None:
+            return issues.get(selected_stream, [])
+        return fetch_stream("updates", selected_stream, append_jql(selected_stream, fromDate, toDate))
+
     def extract_issue_data(issues):
         extracted_data = []
 
@@ -555,7 +697,7 @@ def fetch_jira_issues(selected_stream, fromDate = None, toDate = None):
                 "Product": product,
                 "Track": track,
                 # "Planned_Completed_Date": fields.get("customfield_10112", ""),
-                "On_Track_Comment": issue.get("renderedFields", {}).get("customfield_10262", ""),
+                "On_Track_Comment": html_to_text(issue_id, issue.get("renderedFields", {}).get("customfield_10262", "")),
                 # "Aha_Release": fields.get("customfield_10256", ""),
                 "OnTrack_Status": on_track_status,
                 # "Engineering_Response": engineering_response,
@@ -571,72 +713,6 @@ def fetch_jira_issues(selected_stream, fromDate = None, toDate = None):
 
         return extracted_data
     
-    def create_custom_issue_string_for_prompt(selected_stream, issues):
-        issue_string = f"{selected_stream}:\n"
-        issue_string += "\n"
-        for issue in issues:
-            issue_string += f"- IssueId: {issue['IssueId']}, "
-            issue_string += f"  Summary: {issue['Summary']}, "
-            # issue_string += f"  Status: {issue['Status']}, "
-            issue_string += f"  Product: {issue['Product']}, "
-            issue_string += f"  Track: {issue['Track']}, "
-            # issue_string += f"  Planned_Completed_Date: {issue['Planned_Completed_Date']}, "
-            issue_string += f"  On_Track_Comment: {issue['On_Track_Comment']}, "
-            # issue_string += f"  Aha_Release: {issue['Aha_Release']}, "
-            issue_string += f"  OnTrack_Status: {issue['OnTrack_Status']}, "
-            # issue_string += f"  Engineering_Response: {issue['Engineering_Response']}, "
-            # issue_string += f"  Revised_Completed_Date: {issue['Revised_Completed_Date']}, "
-            issue_string += f"  Release_Type: {issue['Release_Type']}, "
-            # issue_string += f"  Created_Date: {issue['Created_Date']}, "
-            # issue_string += f"  Resolved_Date: {issue['Resolved_Date']}, "
-            # issue_string += f"  InProgress_Date: {issue['InProgress_Date']}, "
-            # issue_string += f"  Closed_Date: {issue['Closed_Date']}\n"
-            # issue_string += f"  Days from Created to Resolved: {issue['Days from Created to Resolved']}, "
-            # issue_string += f"  Days from In Progress to Closed: {issue['Days from In Progress to Closed']}, "
-            issue_string  = issue_string[:-2]
-            issue_string += "\n"
-        issue_string += "\n"
-        return issue_string
-    
-    def fetch_issues_with_pagination(jql, start_at=0, max_results=50):
-        url = "https://pingidentity.atlassian.net/rest/api/3/search?_r=1734441761716"
-        jira_token = "ATATT3xFfGF0ndxink9QUjPTdQruBLLfLdrqtf28sIc3xoG9EyN2Jg7xhQFPzDvzfZNYL82Qa2oWqfZQ4qKUGYVCdy4eAkHh1chHxzVCVX-yWYbJFP-bybz_pkEDBl7xfITGpb4lgcf4UhWjbxAhmS3nYzrVS9FEb-zb_BQTLiDxAIhroWSymsI=1BC0A3B3"
-        auth = HTTPBasicAuth('msomani@pingidentity.com', jira_token)
-
-        payload = json.dumps({
-            "jql": jql,
-            "validateQuery": "warn",
-            "startAt": start_at,
-            "maxResults": max_results,
-            "fields": [
-                "customfield_10078",
-                "customfield_11020",
-                "customfield_11025",
-                "customfield_10112",
-                "summary",
-                "customfield_10262",
-                "status",
-                "customfield_10256",
-                "customfield_10241",
-                "customfield_10100",
-                "customfield_11291",
-                "customfield_11084",
-                "customfield_11404",
-                "customfield_11085"
-            ],
-            "expand": [
-                "renderedFields"
-            ]
-        })
-
-        headers = {
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.post(url, headers=headers, data=payload, auth=auth)
-        result = response.json()
-        return result.get("issues", []), result.get("total", 0)
-    
     def generate_prompt(issue_string, selected_stream):
         prompt = f"""
     You are an Engineering Operations Analyst at Ping Identity company. Ping Identity helps you protect your users and every digital interaction they have while making experiences frictionless. You are responsible for categorizing and summarizing Jira issues for different product stream categories.
@@ -661,7 +737,7 @@ def fetch_jira_issues(selected_stream, fromDate = None, toDate = None):
     "AIC": ["The AIC Analytics and Reporting team released the first two milestones for IGA entities to Product Management and the field for internal feedback."]
     }}
 
-    - Here is the issue_data to categorize:
+    - Here is the issue_data to categorize (pipe-delimited, the first row is the header):
     
     {issue_string}
     """
@@ -673,62 +749,55 @@ def fetch_jira_issues(selected_stream, fromDate = None, toDate = None):
     # Fetch summary for selected product category
     def fetch_summary(issue_string, selected_stream):
         prompt = generate_prompt(issue_string, selected_stream)
+
+        # Reuse the stored summary when this group's issue set has not changed
+        fingerprint = summary_cache.fingerprint("gpt-4o-mini", prompt)
+        summary = summary_cache.get_summary(fingerprint)
+        if summary is not None:
+            return summary
+
         messages = [
         {"role": "system", "content": "You are a helpful assistant."},
         {"role": "user", "content": prompt},
         ]
 
-        completion = openai_client.chat.completions.create(
+        generated_text = llm_executor.complete(
             messages=messages,
             model="gpt-4o-mini",  # Use the appropriate model
             temperature=0.3,
-            stream=False,
+            endpoint="updates",
         )
-        
-        generated_texts = [
-        choice.message.content.strip() for choice in completion.choices
-        ]
 
-        return generated_texts[0]
+        summary_cache.store_summary(fingerprint, generated_text)
+        return generated_text
         
+    def stream_summaries(selected_stream):
+        all_issues = fetch_stream_issues(selected_stream)
+
+        # Process and format all fetched issues
+        issues_data = extract_issue_data(all_issues)
+
+        # Summarize each stream on its own so unchanged streams reuse their stored summary
+        if not issues_data:
+            return {}
+        issue_string = create_custom_issue_string_for_prompt(selected_stream, issues_data)
+        return json.loads(fetch_summary(issue_string, selected_stream))
+
     if selected_stream == "All":
-        stream = ["Identity Trust", "P1AS", "iOPS", "MT SaaS", "Software", "AI / Analytics Data Platform", "AIC"]
-        main_issue_string = ""
-        for selected_stream in stream:
-            jql = append_jql(selected_stream, fromDate, toDate)
-
-            all_issues = []
-            start_at = 0
-            max_results = 50
-            total_issues = 1  # Initialize with a non-zero value to enter the loop
-
-            while start_at < total_issues:
-                issues, total_issues = fetch_issues_with_pagination(jql, start_at, max_results)
-                all_issues.extend(issues)
-                start_at += max_results
-
-            # print(len(all_issues))
-            # Process and format all fetched issues
-            issues_data = extract_issue_data(all_issues)
-
-            # return issues_data
-            issue_string = create_custom_issue_string_for_prompt(selected_stream, issues_data)
-
-            main_issue_string += issue_string
-        return fetch_summary(main_issue_string, "All")
+        results, pending, errors = collect_streams(parts_kind("updates", issues), stream_summaries, fromDate, toDate, latency_budget)
+        # Every stream's summary lists all categories, mostly empty, so merge per
+        # category instead of letting a later stream's empty list replace an earlier one's items
+        summaries = {}
+        for stream in STREAMS:
+            for category, items in results.get(stream, {}).items():
+                if items:
+                    summaries.setdefault(category, []).extend(items if isinstance(items, list) else [items])
+        if latency_budget is not None:
+            return partial_report(summaries, pending, errors)
+        return summaries
     else:
         # Main logic to fetch all issues
-        jql = append_jql(selected_stream, fromDate, toDate)
-
-        all_issues = []
-        start_at = 0
-        max_results = 50
-        total_issues = 1  # Initialize with a non-zero value to enter the loop
-
-        while start_at < total_issues:
-            issues, total_issues = fetch_issues_with_pagination(jql, start_at, max_results)
-            all_issues.extend(issues)
-            start_at += max_results
+        all_issues = fetch_stream_issues(selected_stream)
 
         # print(len(all_issues))
         # Process and format all fetched issues
@@ -736,26 +805,17 @@ def fetch_jira_issues(selected_stream, fromDate = None, toDate = None):
 
         # return issues_data
         issue_string = create_custom_issue_string_for_prompt(selected_stream, issues_data)
-        return fetch_summary(issue_string, selected_stream)
+        return json.loads(fetch_summary(issue_string, selected_stream))
         # return issue_string
 
 
 
-def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None):
+def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None, latency_budget = None, issues = None):
 
     def append_jql(selected_stream, from_date=None, to_date=None):
         base_jql = 'type in (Epic)'
         
-        streams = {
-            "Identity Trust": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA))',
-            "P1AS": 'and Project in (PDO, PP)',
-            "iOPS": 'and project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB)',
-            "MT SaaS": 'and (filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci"))',
-            "Software": 'and project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM)',
-            "AI / Analytics Data Platform": 'and project in (IGA, ANALYTICS, AI)',
-            "AIC": 'and project in (FRAAS)',
-            # "DEFAULT": 'and (issuetype = EPIC and (Project in (PID, PIM, PND, PIDPPQ, NEO) or project = P14C and team = 217c3afb-b962-4afb-8ca8-04769743a1cf-47) or labels in (PingOneMFA) or Project in (PDO, PP) or project in ("SRE Observability Engineering", "SRE Production Services", "SRE Service Management", "SRE Operational Platforms", DevTools, ORB) or filter in ("Arun Goel Org") or project in ("PAX Platform", "PingOne End User Experience", DV) or "Product[Select List (multiple choices)]" in ("PingOne Platform", "PingOne DaVinci") or project in (BRASS, IK, PA, PAPQ, PAA, PASDKC, PASDKJ, PDI, PF, PPQ, POP, OPENIG, OPENIDM, OPENICF, OPENDJ, AMAGENTS, OPENAM) or project in (IGA) or project in (FRAAS))'
-        }
+        streams = STREAM_JQL
         
         if selected_stream in streams:
             jql = base_jql + ' ' + streams[selected_stream]
@@ -844,6 +904,12 @@ def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None):
 
     #     return extract_filed_data(fields, changelog)
     
+    def fetch_stream_issues(selected_stream):
+        # Epics the combined report already fetched skip the Jira crawl
+        if issues is not None:
+            return issues.get(selected_stream, [])
+        return fetch_stream("risk", selected_stream, append_jql(selected_stream, fromDate, toDate))
+
     def extract_issue_data(issues):
         extracted_data = []
 
@@ -888,7 +954,7 @@ def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None):
                 "Product": product,
                 "Track": track,
                 # "Planned_Completed_Date": fields.get("customfield_10112", ""),
-                "On_Track_Comment": issue.get("renderedFields", {}).get("customfield_10262", ""),
+                "On_Track_Comment": html_to_text(issue_id, issue.get("renderedFields", {}).get("customfield_10262", "")),
                 # "Aha_Release": fields.get("customfield_10256", ""),
                 "OnTrack_Status": on_track_status,
                 # "Engineering_Response": engineering_response,
@@ -904,72 +970,6 @@ def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None):
 
         return extracted_data
     
-    def create_custom_issue_string_for_prompt(selected_stream, issues):
-        issue_string = f"{selected_stream}:\n"
-        issue_string += "\n"
-        for issue in issues:
-            issue_string += f"- IssueId: {issue['IssueId']}, "
-            issue_string += f"  Summary: {issue['Summary']}, "
-            # issue_string += f"  Status: {issue['Status']}, "
-            issue_string += f"  Product: {issue['Product']}, "
-            issue_string += f"  Track: {issue['Track']}, "
-            # issue_string += f"  Planned_Completed_Date: {issue['Planned_Completed_Date']}, "
-            issue_string += f"  On_Track_Comment: {issue['On_Track_Comment']}, "
-            # issue_string += f"  Aha_Release: {issue['Aha_Release']}, "
-            issue_string += f"  OnTrack_Status: {issue['OnTrack_Status']}, "
-            # issue_string += f"  Engineering_Response: {issue['Engineering_Response']}, "
-            # issue_string += f"  Revised_Completed_Date: {issue['Revised_Completed_Date']}, "
-            issue_string += f"  Release_Type: {issue['Release_Type']}, "
-            # issue_string += f"  Created_Date: {issue['Created_Date']}, "
-            # issue_string += f"  Resolved_Date: {issue['Resolved_Date']}, "
-            # issue_string += f"  InProgress_Date: {issue['InProgress_Date']}, "
-            # issue_string += f"  Closed_Date: {issue['Closed_Date']}\n"
-            # issue_string += f"  Days from Created to Resolved: {issue['Days from Created to Resolved']}, "
-            # issue_string += f"  Days from In Progress to Closed: {issue['Days from In Progress to Closed']}, "
-            issue_string  = issue_string[:-2]
-            issue_string += "\n"
-        issue_string += "\n"
-        return issue_string
-    
-    def fetch_issues_with_pagination(jql, start_at=0, max_results=50):
-        url = "https://pingidentity.atlassian.net/rest/api/3/search?_r=1734441761716"
-        jira_token = "ATATT3xFfGF0ndxink9QUjPTdQruBLLfLdrqtf28sIc3xoG9EyN2Jg7xhQFPzDvzfZNYL82Qa2oWqfZQ4qKUGYVCdy4eAkHh1chHxzVCVX-yWYbJFP-bybz_pkEDBl7xfITGpb4lgcf4UhWjbxAhmS3nYzrVS9FEb-zb_BQTLiDxAIhroWSymsI=1BC0A3B3"
-        auth = HTTPBasicAuth('msomani@pingidentity.com', jira_token)
-
-        payload = json.dumps({
-            "jql": jql,
-            "validateQuery": "warn",
-            "startAt": start_at,
-            "maxResults": max_results,
-            "fields": [
-                "customfield_10078",
-                "customfield_11020",
-                "customfield_11025",
-                "customfield_10112",
-                "summary",
-                "customfield_10262",
-                "status",
-                "customfield_10256",
-                "customfield_10241",
-                "customfield_10100",
-                "customfield_11291",
-                "customfield_11084",
-                "customfield_11404",
-                "customfield_11085"
-            ],
-            "expand": [
-                "renderedFields"
-            ]
-        })
-
-        headers = {
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.post(url, headers=headers, data=payload, auth=auth)
-        result = response.json()
-        return result.get("issues", []), result.get("total", 0)
-    
     def generate_prompt(issue_string, selected_stream):
         prompt = f"""
     You are an Engineering Operations Analyst at Ping Identity company. Ping Identity helps you protect your users and every digital interaction they have while making experiences frictionless. You are responsible for giving summary of features at Risk / Delayed and the reasons behind the same.
@@ -987,7 +987,7 @@ def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None):
     "In the AIC Product Stream, the feature "API Docs Consolidation feature is att risk/delayed (Issue Id: FRASS-18779)" is at risk/delayed.
     ]
 
-    - Here is the issue_data:
+    - Here is the issue_data (pipe-delimited, the first row is the header):
     
     {issue_string}
     """
@@ -999,63 +999,51 @@ def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None):
     # Fetch summary for selected product category
     def fetch_summary(issue_string, selected_stream):
         prompt = generate_prompt(issue_string, selected_stream)
+
+        # Reuse the stored summary when this group's issue set has not changed
+        fingerprint = summary_cache.fingerprint("gpt-4o", prompt)
+        summary = summary_cache.get_summary(fingerprint)
+        if summary is not None:
+            return summary
+
         messages = [
         {"role": "system", "content": "You are a helpful assistant."},
         {"role": "user", "content": prompt},
         ]
 
-        completion = openai_client.chat.completions.create(
+        generated_text = llm_executor.complete(
             messages=messages,
             model="gpt-4o",  # Use the appropriate model
             temperature=0.3,
-            stream=False,
+            endpoint="risk",
         )
-        
-        generated_texts = [
-        choice.message.content.strip() for choice in completion.choices
-        ]
 
-        return generated_texts[0]
+        summary_cache.store_summary(fingerprint, generated_text)
+        return generated_text
         
+    def stream_risks(selected_stream):
+        all_issues = fetch_stream_issues(selected_stream)
+
+        # Process and format all fetched issues
+        issues_data = extract_issue_data(all_issues)
+
+        # Summarize each stream on its own so unchanged streams reuse their stored summary
+        if not issues_data:
+            return []
+        issue_string = create_custom_issue_string_for_prompt(selected_stream, issues_data)
+        return json.loads(fetch_summary(issue_string, selected_stream))
+
     if selected_stream == "All":
-        stream = ["Identity Trust", "P1AS", "iOPS", "MT SaaS", "Software", "AI / Analytics Data Platform", "AIC"]
-        main_issue_string = ""
-        for selected_stream in stream:
-            jql = append_jql(selected_stream, fromDate, toDate)
-
-            all_issues = []
-            start_at = 0
-            max_results = 50
-            total_issues = 1  # Initialize with a non-zero value to enter the loop
-
-            while start_at < total_issues:
-                issues, total_issues = fetch_issues_with_pagination(jql, start_at, max_results)
-                all_issues.extend(issues)
-                start_at += max_results
-
-            # print(len(all_issues))
-            # Process and format all fetched issues
-            issues_data = extract_issue_data(all_issues)
-
-            # return issues_data
-            issue_string = create_custom_issue_string_for_prompt(selected_stream, issues_data)
-
-            main_issue_string += issue_string
-        # return main_issue_string
-        return fetch_summary(main_issue_string, "All")
+        results, pending, errors = collect_streams(parts_kind("risk", issues), stream_risks, fromDate, toDate, latency_budget)
+        summaries = []
+        for stream in STREAMS:
+            summaries.extend(results.get(stream, []))
+        if latency_budget is not None:
+            return partial_report(summaries, pending, errors)
+        return summaries
     else:
         # Main logic to fetch all issues
-        jql = append_jql(selected_stream, fromDate, toDate)
-
-        all_issues = []
-        start_at = 0
-        max_results = 50
-        total_issues = 1  # Initialize with a non-zero value to enter the loop
-
-        while start_at < total_issues:
-            issues, total_issues = fetch_issues_with_pagination(jql, start_at, max_results)
-            all_issues.extend(issues)
-            start_at += max_results
+        all_issues = fetch_stream_issues(selected_stream)
 
         # print(len(all_issues))
         # Process and format all fetched issues
@@ -1063,42 +1051,290 @@ def fetch_jira_issues2(selected_stream, fromDate = None, toDate = None):
 
         # return issues_data
         issue_string = create_custom_issue_string_for_prompt(selected_stream, issues_data)
-        return fetch_summary(issue_string, selected_stream)
+        return json.loads(fetch_summary(issue_string, selected_stream))
         # return issue_string
 
 
+# The combined report fetches each stream once with the widest of the three
+# reports' conditions and derives the metrics and risk subsets locally
+# The /risk query's On-Track condition: the Dropdown "On-Track" field may be Yellow or Red,
+# "On-Track (migrated)" Yellow (At-Risk) or Red (Delayed). JQL picks fields by name (and
+# type), so the ids they cover are resolved from Jira's field list.
+RISK_ON_TRACK_CONDITIONS = [
+    ("On-Track", ":select", {"Yellow", "Red"}),
+    ("On-Track (migrated)", "", {"Yellow (At-Risk)", "Red (Delayed)"}),
+]
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "6"))
+report_pool = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="report")
+
+def combined_jql(selected_stream, from_date=None, to_date=None):
+    # Same conditions as the /updates query, which covers both other reports
+    jql = 'type in (Epic) ' + STREAM_JQL[selected_stream]
+    if from_date:
+        jql += f' and resolutiondate >= "{from_date} 00:00"'
+    if to_date:
+        jql += f' and resolutiondate <= "{to_date} 23:59"'
+    jql += ' and ("Engineering Response" is not EMPTY or "Engineering Response" is EMPTY) order by cf[10078], "Engineering Response", On-Track desc, key'
+    return jql
+
+def risk_field_values():
+    # Field id -> On-Track values the /risk query accepts in that field
+    values = {}
+    for field in jira_client.fetch_fields():
+        custom = (field.get("schema") or {}).get("custom") or ""
+        for name, field_type, accepted in RISK_ON_TRACK_CONDITIONS:
+            if field.get("name") == name and custom.endswith(field_type):
+                values.setdefault(field["id"], set()).update(accepted)
+    return values
+
+def is_at_risk(issue, field_values):
+    # Same condition as the /risk query, field for field
+    fields = issue.get("fields", {})
+    return any((fields.get(field) or {}).get("value") in accepted for field, accepted in field_values.items())
+
+def resolved_by(issue, last_minute):
+    # /metrics only counts epics resolved up to toDate 00:00
+    resolved = window_cache.resolution_minute(issue.get("fields", {}).get("resolutiondate"))
+    return last_minute is None or (resolved is not None and resolved <= last_minute)
+
+def combined_report(selected_stream, fromDate = None, toDate = None):
+    streams = STREAMS if selected_stream == "All" else [selected_stream]
+    crawls = {stream: stream_pool.submit(contextvars.copy_context().run, fetch_stream, "report", stream,
+                                         combined_jql(stream, fromDate, toDate)) for stream in streams}
+    issues = {stream: crawl.result() for stream, crawl in crawls.items()}
+
+    last_minute = window_cache.to_minute(f"{toDate} 00:00") if toDate else None
+    metric_issues = {stream: [issue for issue in found if resolved_by(issue, last_minute)] for stream, found in issues.items()}
+    field_values = risk_field_values()
+    risk_issues = {stream: [issue for issue in found if is_at_risk(issue, field_values)] for stream, found in issues.items()}
+
+    # Changelogs for the metrics and both LLM summaries run side by side
+    parts = {
+        "metrics": report_pool.submit(contextvars.copy_context().run, metric, selected_stream, fromDate, toDate, issues=metric_issues),
+        "updates": report_pool.submit(contextvars.copy_context().run, fetch_jira_issues, selected_stream, fromDate, toDate, issues=issues),
+        "risk": report_pool.submit(contextvars.copy_context().run, fetch_jira_issues2, selected_stream, fromDate, toDate, issues=risk_issues),
+    }
+    report = {name: part.result() for name, part in parts.items()}
+
+    report["holidays"] = None
+    if fromDate and toDate:
+        holidays = get_holiday_list(fromDate, toDate)
+        # An unreadable workbook leaves the holidays out rather than failing the report
+        if not isinstance(holidays, str):
+            report["holidays"] = holidays
+    return report
+
+
+@app.on_event("startup")
+def load_holiday_index():
+    # Parse the holiday workbook once up front rather than on the first request
+    try:
+        holiday_index.get_holiday_index()
+    except Exception as e:
+        print(f"Holiday index not loaded at startup: {e}")
+
+
+def warm_up_tasks(windows):
+    # The reports the cache warmer keeps fresh for each standard window
+    def report(kind, compute, stream, from_date, to_date):
+        key = (kind, stream, from_date, to_date)
+        return key, lambda: report_cache.refresh(key, lambda: compute(stream, from_date, to_date))
+
+    tasks = []
+    for from_date, to_date in windows:
+        # Holiday lookups are memoised by the holiday index itself
+        tasks.append((("holidays", None, from_date, to_date), lambda f=from_date, t=to_date: get_holiday_list(f, t)))
+        for stream in ["All"] + STREAMS:
+            tasks.append(report("metrics", metric, stream, from_date, to_date))
+            tasks.append(report("updates", fetch_jira_issues, stream, from_date, to_date))
+            tasks.append(report("risk", fetch_jira_issues2, stream, from_date, to_date))
+    return tasks
+
+cache_warmer = CacheWarmer(warm_up_tasks)
+
+@app.on_event("startup")
+def start_cache_warmer():
+    if CACHE_WARM_INTERVAL_SECONDS > 0:
+        cache_warmer.start()
+
+@app.on_event("shutdown")
+def stop_cache_warmer():
+    cache_warmer.stop()
+
+
+@app.get("/internal/scheduler")
+def scheduler_stats():
+    # Queue depth and wait time per class of work for the Jira and OpenAI budgets
+    return {"jira": jira_client.jira_gate.stats(), "openai": llm_executor.slots.stats()}
+
+
+@app.get("/internal/upstreams")
+def upstream_stats():
+    return {"jira": jira_client.jira_breaker.stats(), "openai": llm_executor.breaker.stats()}
+
+@app.get("/internal/metrics")
+def telemetry_metrics():
+    # Prometheus text exposition of this worker's counters and histograms
+    return Response(telemetry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+def cache_headers(etag, age, status):
+    headers = {"X-Cache": status, "Age": str(int(age))}
+    if etag:
+        headers["ETag"] = etag
+    if status == report_cache.STALE:
+        headers["Warning"] = '110 - "Response is Stale"'
+    return headers
+
+def cached_report(key, compute, if_none_match=None, variant=None, render=FastJSONResponse):
+    # variant tags another encoding of the same result, so its ETag never matches the JSON one
+    def tag(etag):
+        return etag[:-1] + "-" + variant + '"' if etag and variant else etag
+
+    # A client that already holds the current version gets a 304 before any Jira or OpenAI work
+    current = report_cache.peek(key)
+    if current is not None and etag_matches(if_none_match, tag(current[0])):
+        etag, age, status = current
+        etag = tag(etag)
+        telemetry.cache_requests.inc("reports", "not_modified")
+        if status == report_cache.STALE:
+            report_cache.revalidate(key, compute)
+        return Response(status_code=304, headers=cache_headers(etag, age, status))
+
+    # Serves the last good result while it is refreshed, flagged with its age.
+    # The cached structure is encoded straight into the response body.
+    try:
+        data, age, status, etag = report_cache.serve(key, compute)
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after) + 1)})
+    return render(data, headers=cache_headers(tag(etag), age, status))
+
+
 @app.post("/holidays")
-def get_holidays(date_range: DateRange):
+def get_holidays(date_range: HolidayRequest, if_none_match: str = Header(None)):
     try:
-        holidays = get_holiday_list(date_range.fromDate, date_range.toDate)
-        # if isinstance(holidays, str):
-        #     raise HTTPException(status_code=500, detail=holidays)
-        return json.loads(holidays)
+        # Holidays only change with the workbook, so its digest versions every answer
+        version = "|".join(str(part) for part in [holiday_index.get_holiday_index().digest, date_range.fromDate,
+                                                  date_range.toDate, date_range.country, date_range.year])
+        etag = '"h-' + hashlib.sha1(version.encode("utf-8")).hexdigest()[:20] + '"'
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        if date_range.country or date_range.year:
+            holidays = get_holiday_entries(date_range.fromDate, date_range.toDate, date_range.country, date_range.year)
+        else:
+            holidays = get_holiday_list(date_range.fromDate, date_range.toDate)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if isinstance(holidays, str):
+        raise HTTPException(status_code=500, detail=holidays)
+    return FastJSONResponse(holidays, headers={"ETag": etag})
     
 
+def metric_ndjson(request):
+    # One line per stream as soon as its statistics are ready, then a closing line
+    for stream, row in metric(request.selected_stream, request.fromDate, request.toDate, incremental=True):
+        if isinstance(row, Exception):
+            yield encode_json({"stream": stream, "error": str(row)}) + b"\n"
+        else:
+            yield encode_json({"stream": stream, "metrics": row}) + b"\n"
+    yield encode_json({"done": True}) + b"\n"
+
+def stream_ndjson(stream):
+    # A cached single-stream report as the same lines metric_ndjson would stream
+    def render(report, headers):
+        body = encode_json({"stream": stream, "metrics": report.get(stream, [])}) + b"\n" + encode_json({"done": True}) + b"\n"
+        return Response(body, media_type="application/x-ndjson", headers=headers)
+    return render
+
 @app.post("/metrics")
-def metric_endpoint(request: JiraRequest):
+def metric_endpoint(request: JiraRequest, accept: str = Header(None), if_none_match: str = Header(None)):
+    ndjson = accept and "application/x-ndjson" in accept
+    if ndjson and request.selected_stream == "All":
+        return StreamingResponse(metric_ndjson(request), media_type="application/x-ndjson")
     try:
-        data = metric(request.selected_stream, request.fromDate, request.toDate)
-        return json.loads(data)
+        if ndjson:
+            # One stream has nothing to stream early, so it is served from the JSON report's entry
+            return cached_report(
+                ("metrics", request.selected_stream, request.fromDate, request.toDate),
+                lambda: metric(request.selected_stream, request.fromDate, request.toDate), if_none_match,
+                "nd", stream_ndjson(request.selected_stream))
+        if request.selected_stream == "All" and request.latencyBudget is not None:
+            # Partial results are never cached as the whole report
+            return FastJSONResponse(metric("All", request.fromDate, request.toDate, request.latencyBudget))
+        return cached_report(
+            ("metrics", request.selected_stream, request.fromDate, request.toDate),
+            lambda: metric(request.selected_stream, request.fromDate, request.toDate), if_none_match)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 
 @app.post("/updates")
-def fetch_jira_issues_endpoint(request: JiraRequest):
+def fetch_jira_issues_endpoint(request: JiraRequest, if_none_match: str = Header(None)):
     try:
-        result = fetch_jira_issues(request.selected_stream, request.fromDate, request.toDate)
-        return json.loads(result)
+        if request.selected_stream == "All" and request.latencyBudget is not None:
+            # Partial results are never cached as the whole report
+            return FastJSONResponse(fetch_jira_issues("All", request.fromDate, request.toDate, request.latencyBudget))
+        return cached_report(
+            ("updates", request.selected_stream, request.fromDate, request.toDate),
+            lambda: fetch_jira_issues(request.selected_stream, request.fromDate, request.toDate), if_none_match)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.post("/risk")
-def fetch_jira_issues2_endpoint(request: JiraRequest):
+def fetch_jira_issues2_endpoint(request: JiraRequest, if_none_match: str = Header(None)):
     try:
-        result = fetch_jira_issues2(request.selected_stream, request.fromDate, request.toDate)
-        return json.loads(result)
+        if request.selected_stream == "All" and request.latencyBudget is not None:
+            # Partial results are never cached as the whole report
+            return FastJSONResponse(fetch_jira_issues2("All", request.fromDate, request.toDate, request.latencyBudget))
+        return cached_report(
+            ("risk", request.selected_stream, request.fromDate, request.toDate),
+            lambda: fetch_jira_issues2(request.selected_stream, request.fromDate, request.toDate), if_none_match)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/report")
+def combined_report_endpoint(request: JiraRequest, if_none_match: str = Header(None)):
+    # Metrics, updates, risk and holidays for one stream and date range from a single Jira crawl
+    try:
+        return cached_report(
+            ("report", request.selected_stream, request.fromDate, request.toDate),
+            lambda: combined_report(request.selected_stream, request.fromDate, request.toDate), if_none_match)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+REPORTS = {"metrics": metric, "updates": fetch_jira_issues, "risk": fetch_jira_issues2, "report": combined_report}
+
+@app.post("/jobs/{report}", status_code=202)
+def submit_report_job(report: str, request: JiraRequest):
+    # Runs the report on the job pool; poll GET /jobs/{job_id} for progress and the result
+    if report not in REPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown report: {report}")
+    compute = REPORTS[report]
+    key = (report, request.selected_stream, request.fromDate, request.toDate)
+    params = {"selected_stream": request.selected_stream, "fromDate": request.fromDate, "toDate": request.toDate}
+    job = jobs.submit(report, params, lambda: report_cache.serve(
+        key, lambda: compute(request.selected_stream, request.fromDate, request.toDate))[0])
+    return {"job_id": job.id, "status": job.status}
+
+@app.get("/jobs/{job_id}")
+def report_job_status(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return FastJSONResponse(job.to_dict())
@@ -0,0 +1,81 @@
+import os
+import threading
+from datetime import date
+
+import holiday_index
+
+# Working-day arithmetic for cycle-time metrics. Each country's calendar is a
+# precomputed working-day mask with a cumulative count, so the number of
+# business days in any interval is a single subtraction. numpy is imported on
+# first use so workers that never compute metrics start without it.
+# The holiday workbook lists one year's dates; each holiday is taken to fall on
+# the same month/day in every year of the calendar, so epics from other years
+# still skip holidays rather than counting them as working days.
+BUSINESS_DAY_COUNTRY = os.getenv("BUSINESS_DAY_COUNTRY", "United States")
+CALENDAR_START = date(2000, 1, 1)
+CALENDAR_END = date(2040, 12, 31)
+
+
+class BusinessCalendar:
+    def __init__(self, holiday_ordinals, start=CALENDAR_START, end=CALENDAR_END):
+        import numpy as np
+
+        self.start = start.toordinal()
+        ordinals = np.arange(self.start, end.toordinal() + 1)
+
+        # date.toordinal() is 1 on Monday 0001-01-01, so (ordinal - 1) % 7 is the weekday
+        working = ((ordinals - 1) % 7) < 5
+        working &= ~np.isin(ordinals, np.asarray(holiday_ordinals, dtype=ordinals.dtype))
+
+        # cumulative[i] = working days strictly before day i of the calendar
+        self.cumulative = np.concatenate(([0], np.cumsum(working)))
+        self.size = len(ordinals)
+
+    def business_days(self, starts, ends):
+        # Working days in [start, end) for every pair of Jira timestamps; NaN when either is missing
+        return self.business_days_between(to_day_ordinals(starts), to_day_ordinals(ends))
+
+    def business_days_between(self, starts, ends):
+        # Same for arrays of day ordinals (float, NaN when missing)
+        import numpy as np
+
+        starts = starts - self.start
+        ends = ends - self.start
+        missing = np.isnan(starts) | np.isnan(ends)
+
+        start_index = np.clip(np.nan_to_num(starts), 0, self.size).astype(np.int64)
+        end_index = np.clip(np.nan_to_num(ends), 0, self.size).astype(np.int64)
+        counts = (self.cumulative[end_index] - self.cumulative[start_index]).astype(float)
+        counts[missing] = np.nan
+        return counts
+
+
+def to_day_ordinals(timestamps):
+    # "2024-10-05T10:00:00.000-0700" -> proleptic ordinal of its local date
+    import numpy as np
+
+    days = np.array([value[:10] if value else "NaT" for value in timestamps], dtype="datetime64[D]")
+    ordinals = (days - np.datetime64("0001-01-01", "D")).astype(float) + 1
+    ordinals[np.isnat(days)] = np.nan
+    return ordinals
+
+
+_lock = threading.Lock()
+_calendars = {}
+
+
+def get_business_calendar(country=BUSINESS_DAY_COUNTRY):
+    index = holiday_index.get_holiday_index()
+    cache_key = (holiday_index.country_key(country), index.digest)
+    calendar = _calendars.get(cache_key)
+    if calendar is not None:
+        return calendar
+
+    with _lock:
+        if cache_key not in _calendars:
+            # The country's holidays from the workbook, weekends everywhere else
+            dates = index.holiday_ordinals(cache_key[0], CALENDAR_START.year, CALENDAR_END.year)
+            for stale_key in [key for key in _calendars if key[1] != index.digest]:
+                del _calendars[stale_key]
+            _calendars[cache_key] = BusinessCalendar(dates)
+        return _calendars[cache_key]
@@ -0,0 +1,58 @@
+import os
+import random
+import threading
+from datetime import date, timedelta
+
+import scheduler
+
+# Background refresh of the reports users ask for most: the current month,
+# last month and the current quarter. Disabled unless an interval is set.
+CACHE_WARM_INTERVAL_SECONDS = float(os.getenv("CACHE_WARM_INTERVAL_SECONDS", "0"))
+CACHE_WARM_JITTER = float(os.getenv("CACHE_WARM_JITTER", "0.1"))
+
+
+def month_end(day):
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def reporting_windows(today=None):
+    today = today or date.today()
+    this_month = today.replace(day=1)
+    last_month = (this_month - timedelta(days=1)).replace(day=1)
+    quarter = today.replace(month=3 * ((today.month - 1) // 3) + 1, day=1)
+    windows = [
+        (this_month, month_end(this_month)),
+        (last_month, month_end(last_month)),
+        (quarter, month_end(quarter.replace(month=quarter.month + 2))),
+    ]
+    return [(start.isoformat(), end.isoformat()) for start, end in windows]
+
+
+class CacheWarmer(threading.Thread):
+    def __init__(self, build_tasks, interval=CACHE_WARM_INTERVAL_SECONDS, jitter=CACHE_WARM_JITTER):
+        super().__init__(name="cache-warmer", daemon=True)
+        # build_tasks(windows) -> [(name, function that refreshes it), ...]
+        self.build_tasks = build_tasks
+        self.interval = interval
+        self.jitter = jitter
+        self.stopped = threading.Event()
+
+    def run(self):
+        # Jira and OpenAI calls made from this thread are scheduled as warm-up work
+        scheduler.request_class.set(scheduler.WARMUP)
+
+        # Spread workers (and restarts) out instead of hitting Jira together
+        self.stopped.wait(random.uniform(0, self.interval * self.jitter))
+        while not self.stopped.is_set():
+            for name, warm in self.build_tasks(reporting_windows()):
+                if self.stopped.is_set():
+                    return
+                try:
+                    warm()
+                except Exception as e:
+                    print(f"Cache warm-up failed for {name}: {e}")
+            self.stopped.wait(self.interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Stops calling an upstream (Jira, OpenAI) after repeated failures so requests
+# fail fast, and cached reports can be served, instead of waiting on timeouts.
+# After a cool-down a single trial call decides whether the circuit closes again.
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def before(self):
+        with self.lock:
+            if self.state == OPEN:
+                retry_after = self.opened_at + self.reset_timeout - time.monotonic()
+                if retry_after > 0:
+                    raise CircuitOpenError(self.name, retry_after)
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                # Only one trial call while half-open, everyone else keeps failing fast
+                if self.trial_in_flight:
+                    raise CircuitOpenError(self.name, self.reset_timeout)
+                self.trial_in_flight = True
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def record_skipped(self):
+        # The call never reached the upstream: no verdict either way, and a
+        # half-open trial is left to the next caller
+        with self.lock:
+            self.trial_in_flight = False
+
+    @contextmanager
+    def guard(self, failures=(Exception,), skipped=()):
+        # Exceptions of the given failure types count against the upstream, skipped
+        # ones mean it was never called; anything else means it answered, so the
+        # call counts as a success
+        self.before()
+        try:
+            yield
+        except skipped:
+            self.record_skipped()
+            raise
+        except failures:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.record_success()
+            raise
+        self.record_success()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "open_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.state != CLOSED else 0,
+            }
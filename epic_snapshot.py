@@ -0,0 +1,245 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta
+
+import scheduler
+import window_cache
+
+# Resolved epics with their extracted fields and changelog dates, published by
+# the sync process (python epic_snapshot.py) as one immutable columnar file.
+# Every worker maps the same file, so /metrics reads shared pages instead of
+# each worker keeping its own copy of the epics.
+EPIC_SNAPSHOT_PATH = os.getenv("EPIC_SNAPSHOT_PATH", ".epic_snapshot.bin")
+# How far back the sync process collects resolved epics
+EPIC_SNAPSHOT_DAYS = int(os.getenv("EPIC_SNAPSHOT_DAYS", "400"))
+EPIC_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("EPIC_SNAPSHOT_INTERVAL_SECONDS", "900"))
+# Workers stop using a snapshot the sync process has not refreshed for this long
+EPIC_SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("EPIC_SNAPSHOT_MAX_AGE_SECONDS", "3600"))
+
+SNAPSHOT_MAGIC = b"PEPIC1\n"
+# One int32 per epic in each column; rows are sorted by stream, then resolution minute.
+# Day columns hold proleptic ordinals (0 when the date is missing).
+SNAPSHOT_COLUMNS = [
+    "stream", "resolved_minute", "on_track", "response",
+    "days_created_to_resolved", "days_in_progress_to_closed",
+    "created_day", "resolved_day", "in_progress_day", "closed_day",
+]
+
+
+def day_ordinal(timestamp):
+    # Local date of a Jira timestamp, as business_calendar reads it
+    return date.fromisoformat(timestamp[:10]).toordinal() if timestamp else 0
+
+
+class EpicSnapshot:
+    def __init__(self, data, header, offset, key):
+        # numpy is only loaded once a worker actually has a snapshot to read
+        import numpy as np
+
+        self.data = data
+        self.key = key
+        self.streams = header["streams"]
+        self.published_at = header["published_at"]
+        self.start = header["start_minute"]
+        self.end = header["end_minute"]
+        self.codes = {value: i for i, value in enumerate(header["strings"])}
+        # Row range of each stream
+        self.bounds = {stream: tuple(bounds) for stream, bounds in zip(self.streams, header["bounds"])}
+
+        # Zero-copy int32 views over the mapped file
+        rows = header["rows"]
+        self.columns = {}
+        for name in SNAPSHOT_COLUMNS:
+            self.columns[name] = np.frombuffer(data, dtype=np.int32, count=rows, offset=offset)
+            offset += rows * 4
+
+    def covers(self, start):
+        return start >= self.start
+
+    def statistics(self, stream, start, end, calendar):
+        # Same numbers as metric() computes from the epics resolved in [start, end)
+        # minutes, or None when the window starts before the snapshot does
+        import numpy as np
+
+        if not self.covers(start) or stream not in self.bounds:
+            return None
+        first, last = self.bounds[stream]
+        minutes = self.columns["resolved_minute"][first:last]
+        lo = first + int(np.searchsorted(minutes, start, side="left"))
+        hi = first + int(np.searchsorted(minutes, end, side="left"))
+        total_epics = hi - lo
+        if total_epics == 0:
+            return []
+
+        def count(column, *values):
+            codes = [self.codes[value] for value in values if value in self.codes]
+            return int(np.isin(self.columns[column][lo:hi], codes).sum()) if codes else 0
+
+        def days(column):
+            ordinals = self.columns[column][lo:hi].astype(float)
+            ordinals[ordinals == 0] = np.nan
+            return ordinals
+
+        completed = count("on_track", "Blue (Complete)")
+        in_progress = count("on_track", "In Progress")
+        at_risk = count("on_track", "At Risk")
+        not_started = count("on_track", "Not Started")
+        committed_or_stretch = count("response", "Committed", "Stretch")
+        total_days_created_to_resolved = int(self.columns["days_created_to_resolved"][lo:hi].sum(dtype=np.int64))
+        total_days_in_progress_to_closed = int(self.columns["days_in_progress_to_closed"][lo:hi].sum(dtype=np.int64))
+        total_business_days_created_to_resolved = float(np.nansum(
+            calendar.business_days_between(days("created_day"), days("resolved_day"))))
+        total_business_days_in_progress_to_closed = float(np.nansum(
+            calendar.business_days_between(days("in_progress_day"), days("closed_day"))))
+
+        return [
+            total_epics,
+            completed,
+            in_progress,
+            at_risk,
+            0,
+            not_started,
+            round(committed_or_stretch / total_epics * 100, 2),
+            round(total_days_created_to_resolved / total_epics, 2),
+            round(total_days_in_progress_to_closed / total_epics, 2),
+            round(total_business_days_created_to_resolved / total_epics, 2),
+            round(total_business_days_in_progress_to_closed / total_epics, 2),
+        ]
+
+
+def write_snapshot(records, start, end, path=EPIC_SNAPSHOT_PATH):
+    # records maps each stream to the epic dicts metric() extracts for it
+    streams = list(records)
+    strings = sorted({epic.get(field) or "" for epics in records.values() for epic in epics
+                      for field in ("OnTrack_Status", "Engineering_Response")})
+    codes = {value: i for i, value in enumerate(strings)}
+
+    columns = {name: array("i") for name in SNAPSHOT_COLUMNS}
+    bounds = []
+    for stream_code, stream in enumerate(streams):
+        rows = []
+        for epic in records[stream]:
+            minute = window_cache.resolution_minute(epic.get("Resolved_Date"))
+            if minute is not None:
+                rows.append((minute, epic))
+        rows.sort(key=lambda row: row[0])
+        bounds.append([len(columns["stream"]), len(columns["stream"]) + len(rows)])
+        for minute, epic in rows:
+            columns["stream"].append(stream_code)
+            columns["resolved_minute"].append(minute)
+            columns["on_track"].append(codes[epic.get("OnTrack_Status") or ""])
+            columns["response"].append(codes[epic.get("Engineering_Response") or ""])
+            columns["days_created_to_resolved"].append(epic.get("Days from Created to Resolved") or 0)
+            columns["days_in_progress_to_closed"].append(epic.get("Days from In Progress to Closed") or 0)
+            columns["created_day"].append(day_ordinal(epic.get("Created_Date")))
+            columns["resolved_day"].append(day_ordinal(epic.get("Resolved_Date")))
+            columns["in_progress_day"].append(day_ordinal(epic.get("InProgress_Date")))
+            columns["closed_day"].append(day_ordinal(epic.get("Closed_Date")))
+
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "published_at": time.time(),
+        "start_minute": start,
+        "end_minute": end,
+        "streams": streams,
+        "strings": strings,
+        "bounds": bounds,
+        "rows": len(columns["stream"]),
+    }).encode("utf-8")
+    # Pad so the columns start on a 4-byte boundary
+    header += b" " * (-(len(SNAPSHOT_MAGIC) + 4 + len(header)) % 4)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for name in SNAPSHOT_COLUMNS:
+            f.write(columns[name].tobytes())
+    # Workers still mapping the old file keep reading it; new lookups see the new one
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path, key):
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    # A truncated or malformed file counts as no snapshot, so /metrics is computed live
+    try:
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            return None
+        offset = len(SNAPSHOT_MAGIC)
+        header_length = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        header = json.loads(data[offset:offset + header_length])
+        if header["byteorder"] != sys.byteorder:
+            return None
+        offset += header_length
+        if len(data) != offset + header["rows"] * 4 * len(SNAPSHOT_COLUMNS):
+            return None
+        return EpicSnapshot(data, header, offset, key)
+    except (struct.error, ValueError, KeyError, TypeError):
+        return None
+
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def get_epic_snapshot(path=EPIC_SNAPSHOT_PATH):
+    global _snapshot
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    snapshot = _snapshot
+    if snapshot is None or snapshot.key != key:
+        with _lock:
+            snapshot = _snapshot
+            if snapshot is None or snapshot.key != key:
+                snapshot = _snapshot = load_snapshot(path, key)
+    if snapshot is None or time.time() - snapshot.published_at > EPIC_SNAPSHOT_MAX_AGE_SECONDS:
+        return None
+    return snapshot
+
+
+def sync(collect, streams, path=EPIC_SNAPSHOT_PATH):
+    # collect(stream, from_date, to_date) -> the stream's epics resolved in that range
+    today = datetime.now(window_cache.JIRA_TIMEZONE).date()
+    from_date = (today - timedelta(days=EPIC_SNAPSHOT_DAYS)).isoformat()
+    to_date = (today + timedelta(days=1)).isoformat()
+    records = {stream: collect(stream, from_date, to_date) for stream in streams}
+    # Same bounds as metric(): from 00:00 through the 00:00 minute of to_date
+    start = window_cache.to_minute(f"{from_date} 00:00")
+    end = window_cache.to_minute(f"{to_date} 00:00") + 1
+    write_snapshot(records, start, end, path)
+    return sum(len(epics) for epics in records.values())
+
+
+if __name__ == "__main__":
+    # Sync process: python epic_snapshot.py [--once]
+    import backend
+
+    scheduler.request_class.set(scheduler.SYNC)
+    while True:
+        started = time.time()
+        try:
+            count = sync(lambda stream, from_date, to_date: backend.metric(stream, from_date, to_date, records=True),
+                         backend.STREAMS)
+            print(f"Published {EPIC_SNAPSHOT_PATH} ({count} epics in {time.time() - started:.1f}s)")
+        except Exception as e:
+            print(f"Epic snapshot sync failed: {e}")
+        if "--once" in sys.argv:
+            break
+        time.sleep(EPIC_SNAPSHOT_INTERVAL_SECONDS)
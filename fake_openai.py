@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+# Offline stand-in for the OpenAI chat completions API.
+# Run with:  uvicorn fake_openai:app --port 8001
+# and point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:8001/v1
+FAKE_OPENAI_TOKENS_PER_SECOND = float(os.getenv("FAKE_OPENAI_TOKENS_PER_SECOND", "60"))
+FAKE_OPENAI_TTFT_MS = float(os.getenv("FAKE_OPENAI_TTFT_MS", "500"))
+
+STREAMS = ["Identity Trust", "P1AS", "iOPS", "MT SaaS", "Software", "AI / Analytics Data Platform", "AIC"]
+
+app = FastAPI()
+
+
+def parse_issue_rows(prompt):
+    # Issue rows follow the header row written by create_custom_issue_string_for_prompt
+    rows = []
+    header = None
+    for line in prompt.splitlines():
+        line = line.strip()
+        if line.startswith("IssueId|"):
+            header = line.split("|")
+        elif not line:
+            header = None
+        elif header and line.count("|") == len(header) - 1:
+            rows.append(dict(zip(header, line.split("|"))))
+    return rows
+
+
+def canned_output(prompt):
+    match = re.search(r"Only show data for: (.+)\s*$", prompt)
+    streams = [match.group(1).strip()] if match else STREAMS
+    rows = parse_issue_rows(prompt)
+
+    if "Risk / Delayed" in prompt:
+        # Same shape as the /risk prompt asks for: a list of sentences
+        risky = [row for row in rows if row.get("OnTrack_Status", "").startswith(("Yellow", "Red", "At Risk"))]
+        return json.dumps([
+            f"In the {streams[0]} product stream, the feature \"{row.get('Summary', '')} (Issue Id: {row.get('IssueId', '')})\" "
+            f"is at risk/delayed. {row.get('On_Track_Comment') or 'No reason was given.'}"
+            for row in risky
+        ])
+
+    # Same shape as the /updates prompt asks for: stream -> at most two summaries
+    summaries = {}
+    for stream in streams:
+        products = sorted({row.get("Product") or "General" for row in rows}) or ["General"]
+        summaries[stream] = [f"{product} delivered {sum(1 for row in rows if (row.get('Product') or 'General') == product)} epics this period." for product in products[:2]]
+    return json.dumps(summaries)
+
+
+def split_tokens(text):
+    # Roughly four characters per token, like the real tokenizer on English text
+    return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+def usage_for(prompt, tokens):
+    prompt_tokens = max(1, len(prompt) // 4)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens), "total_tokens": prompt_tokens + len(tokens)}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "gpt-4o")
+    prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+    tokens = split_tokens(canned_output(prompt))
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    token_delay = 1.0 / FAKE_OPENAI_TOKENS_PER_SECOND if FAKE_OPENAI_TOKENS_PER_SECOND > 0 else 0
+
+    if not body.get("stream"):
+        await asyncio.sleep(FAKE_OPENAI_TTFT_MS / 1000 + len(tokens) * token_delay)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+            "usage": usage_for(prompt, tokens),
+        }
+
+    async def stream_chunks():
+        def chunk(delta, finish_reason=None):
+            return "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }) + "\n\n"
+
+        await asyncio.sleep(FAKE_OPENAI_TTFT_MS / 1000)
+        yield chunk({"role": "assistant", "content": ""})
+        for token in tokens:
+            yield chunk({"content": token})
+            await asyncio.sleep(token_delay)
+        yield chunk({}, "stop")
+        if body.get("stream_options", {}).get("include_usage"):
+            yield "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage_for(prompt, tokens),
+            }) + "\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream_chunks(), media_type="text/event-stream")
@@ -0,0 +1,37 @@
+// Last ETag and parsed body per request, so repeating a query is answered
+// with 304 Not Modified instead of downloading the same report again
+const lastResponses = new Map();
+
+export const fetchReport = async (url, payload) => {
+  const body = JSON.stringify(payload);
+  const cacheKey = `${url} ${body}`;
+  const cached = lastResponses.get(cacheKey);
+
+  const headers = {
+    "Content-Type": "application/json",
+  };
+  if (cached) {
+    headers["If-None-Match"] = cached.etag;
+  }
+
+  const response = await fetch(url, {
+    method: "POST",
+    headers,
+    body,
+  });
+
+  if (response.status === 304 && cached) {
+    return cached.result;
+  }
+
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  const result = await response.json();
+  const etag = response.headers.get("ETag");
+  if (etag) {
+    lastResponses.set(cacheKey, { etag, result });
+  }
+  return result;
+};
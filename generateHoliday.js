@@ -1,20 +1,10 @@
+import { fetchReport } from "./fetchReport";
+
 export const generateHoliday = async (actionType, fromDate, toDate) => {
-  const response = await fetch("http://127.0.0.1:8000/holidays", {
-    method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-    },
-    body: JSON.stringify({
-      fromDate,
-      toDate,
-    }),
+  const result = await fetchReport("http://127.0.0.1:8000/holidays", {
+    fromDate,
+    toDate,
   });
-
-  if (!response.ok) {
-    throw new Error(`HTTP error! status: ${response.status}`);
-  }
-
-  const result = await response.json();
   console.log({ fromDate });
 
   // Format the holidays into an HTML list
@@ -1,10 +1,12 @@
-export const generateMetrics = async (fromDate, toDate, selectedOption) => {
+export const generateMetrics = async (fromDate, toDate, selectedOption, onUpdate) => {
   // Fetch data from the backend
   console.log({ fromDate , toDate, selectedOption});
   const response = await fetch("http://127.0.0.1:8000/metrics", {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
+      // One JSON line per stream as soon as its numbers are ready
+      Accept: "application/x-ndjson",
     },
     body: JSON.stringify({
       fromDate,
@@ -17,20 +19,11 @@ export const generateMetrics = async (fromDate, toDate, selectedOption) => {
     throw new Error(`HTTP error! status: ${response.status}`);
   }
 
-  const result = await response.json();
-
-  // Generate table rows dynamically based on the fetched data
-  const tableRows = Object.entries(result)
-  .map(([key, values]) => {
-    const columns = values.map(value => `<td>${value}</td>`).join(''); // Convert values to table columns
-    return `<tr><th style="text-align:left;"><strong>${key}</strong></th>${columns}</tr>`;
-  })
-  .join('');
-  const columnNames = ["Total Epics", "Completed Epics", "In Progress Epics", "At Risk Epics", "Delayed Epics", "Not Started Epic", "Delivery Commit %", "Avg Epic Age",  "Avg Epic Fix Time"];
-
+  const columnNames = ["Total Epics", "Completed Epics", "In Progress Epics", "At Risk Epics", "Delayed Epics", "Not Started Epic", "Delivery Commit %", "Avg Epic Age",  "Avg Epic Fix Time", "Avg Epic Age (Business Days)", "Avg Epic Fix Time (Business Days)"];
+  const tableRows = [];
 
   // Construct the complete table
-  const table = `
+  const buildTable = () => `
     <table border="1" style="border-collapse:collapse; width:100%;">
       <thead>
         <tr>
@@ -39,10 +32,43 @@ export const generateMetrics = async (fromDate, toDate, selectedOption) => {
         </tr>
       </thead>
       <tbody>
-        ${tableRows}
+        ${tableRows.join('')}
       </tbody>
     </table>
   `;
 
-  return table;
+  // Generate a table row for each stream as its line arrives
+  const addRow = (line) => {
+    if (!line.trim()) {
+      return;
+    }
+    const row = JSON.parse(line);
+    if (row.stream === undefined) {
+      return;
+    }
+    const columns = row.error
+      ? `<td colspan="${columnNames.length}">Error: ${row.error}</td>`
+      : row.metrics.map(value => `<td>${value}</td>`).join(''); // Convert values to table columns
+    tableRows.push(`<tr><th style="text-align:left;"><strong>${row.stream}</strong></th>${columns}</tr>`);
+    if (onUpdate) {
+      onUpdate(buildTable());
+    }
+  };
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop();
+    lines.forEach(addRow);
+  }
+  addRow(buffered + decoder.decode());
+
+  return buildTable();
 };
@@ -0,0 +1,339 @@
+import calendar
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+# Preparsed holiday calendar, built once from the workbook and rebuilt only
+# when the workbook's mtime and content hash change.
+HOLIDAY_WORKBOOK = os.getenv("HOLIDAY_WORKBOOK", "PingHolidayList.xlsx")
+# Binary snapshot of the parsed workbook, so workers can skip the openpyxl parse
+HOLIDAY_SNAPSHOT = os.getenv("HOLIDAY_SNAPSHOT", HOLIDAY_WORKBOOK + ".idx")
+QUERY_CACHE_SIZE = 4096
+
+SNAPSHOT_MAGIC = b"PHIDX2\n"
+SNAPSHOT_COLUMNS = ["country", "holiday", "month", "day", "day_ordinal", "entry"]
+
+
+def day_of_year(month, day):
+    # Ordinal in a leap year so every month/day, including Feb 29, has a slot
+    return (date(2000, month, day) - date(1999, 12, 31)).days
+
+
+def country_key(country):
+    # Workbook country names carry stray whitespace ("Switzerland ")
+    return " ".join(country.split()).casefold()
+
+
+def infer_year(weekdays, months, days):
+    # The workbook only has "Weekday, Month DD"; the year is the one whose
+    # calendar agrees with the most weekday names
+    this_year = date.today().year
+    candidates = range(this_year - 5, this_year + 6)
+    return max(candidates, key=lambda year: sum(
+        1 for weekday, month, day in zip(weekdays, months, days)
+        if (month, day) != (2, 29) and date(year, month, day).strftime('%A') == weekday
+    ))
+
+
+class HolidayIndex:
+    def __init__(self, countries, holiday_names, months, days, year, day_ordinals, entries, mtime, digest):
+        # The holiday data is never mutated after construction.
+        # One row per workbook holiday, in workbook order
+        self.countries = countries
+        self.holiday_names = holiday_names
+        self.months = months
+        self.days = days
+        # Calendar year the workbook describes
+        self.year = year
+        # Sorted day-of-year ordinals with the formatted holiday line for each day
+        self.day_ordinals = day_ordinals
+        self.entries = entries
+        self.mtime = mtime
+        self.digest = digest
+        self.query_cache = {}
+
+        # Posting lists: per country (and "" for every country) the rows in date
+        # order, with the matching month/day keys (e.g. 1225) for bisection
+        self.postings = {}
+        rows = sorted(range(len(countries)), key=lambda row: (months[row], days[row], row))
+        for row in rows:
+            for key in ("", country_key(countries[row])):
+                month_days, posting = self.postings.setdefault(key, ([], []))
+                month_days.append(months[row] * 100 + days[row])
+                posting.append(row)
+
+    @classmethod
+    def from_frame(cls, df, mtime, digest):
+        day_ordinals, entries = format_holidays_by_date(df)
+        months = df['Month'].tolist()
+        days = df['Day'].tolist()
+        return cls(
+            df['Country'].astype(str).tolist(),
+            df['Holiday'].astype(str).tolist(),
+            months,
+            days,
+            infer_year(df['Weekday'].tolist(), months, days),
+            day_ordinals,
+            entries,
+            mtime,
+            digest,
+        )
+
+    def between(self, from_date, to_date):
+        from_date = datetime.strptime(from_date, '%Y-%m-%d')
+        to_date = datetime.strptime(to_date, '%Y-%m-%d')
+        from_day = day_of_year(from_date.month, from_date.day)
+        to_day = day_of_year(to_date.month, to_date.day)
+        start = bisect_left(self.day_ordinals, from_day)
+        end = bisect_right(self.day_ordinals, to_day)
+
+        if from_day > to_day:  # Handle year wraparound (e.g., Oct 01 to Feb 15) as two slices
+            return self.entries[:end] + self.entries[start:]
+        return self.entries[start:end]
+
+    def dates(self, rows, year):
+        # The workbook describes one year; its holidays are taken to recur on the
+        # same month/day every year (Feb 29 only in leap years)
+        for row in rows:
+            if (self.months[row], self.days[row]) != (2, 29) or calendar.isleap(year):
+                yield row, date(year, self.months[row], self.days[row])
+
+    def holiday_ordinals(self, country, first_year, last_year):
+        # Every date of a country's holidays from first_year through last_year
+        _, posting = self.postings.get(country_key(country), ([], []))
+        return [holiday_date.toordinal() for year in range(first_year, last_year + 1)
+                for _, holiday_date in self.dates(posting, year)]
+
+    def lookup(self, from_date, to_date, country=None, year=None):
+        # Real calendar dates: the workbook's holidays projected onto every year the range covers
+        first = datetime.strptime(from_date, '%Y-%m-%d').date()
+        last = datetime.strptime(to_date, '%Y-%m-%d').date()
+        if last < first:
+            # Wrapped range (e.g. Oct 01 to Feb 15), read as between() reads it: through the next Feb 15
+            wrap_year = first.year if (last.month, last.day) >= (first.month, first.day) else first.year + 1
+            last = date(wrap_year, last.month, min(last.day, calendar.monthrange(wrap_year, last.month)[1]))
+        if year is not None:
+            first = max(first, date(year, 1, 1))
+            last = min(last, date(year, 12, 31))
+
+        month_days, posting = self.postings.get(country_key(country) if country else "", ([], []))
+
+        # Consolidate countries for the same holiday on the same date
+        holidays = {}
+        for holiday_year in range(first.year, last.year + 1):
+            lo = first.month * 100 + first.day if holiday_year == first.year else 101
+            hi = last.month * 100 + last.day if holiday_year == last.year else 1231
+            rows = posting[bisect_left(month_days, lo):bisect_right(month_days, hi)]
+            for row, holiday_date in self.dates(rows, holiday_year):
+                countries = holidays.setdefault((holiday_date.isoformat(), self.holiday_names[row]), set())
+                countries.add(" ".join(self.countries[row].split()))
+
+        return [
+            {"date": holiday_date, "holiday": holiday, "countries": sorted(countries)}
+            for (holiday_date, holiday), countries in holidays.items()
+        ]
+
+
+def format_holidays_by_date(df):
+    if df.empty:
+        return [], []
+
+    # Same holiday listed twice for a country on one date only counts once
+    df = df.drop_duplicates(subset=['MonthDay', 'Holiday', 'Country'])
+
+    # Holidays on a date keep workbook order, their countries are listed alphabetically
+    df = df.assign(First=df.groupby(['MonthDay', 'Holiday'], dropna=False)['Row'].transform('min'))
+    df = df.sort_values(by=['MonthDay', 'First', 'Country'])
+
+    # Consolidate countries per holiday, then holidays per date
+    entries = df.groupby(['MonthDay', 'First', 'Holiday'], sort=False, dropna=False)['Country'].agg(', '.join).reset_index()
+    entries['Entry'] = entries['Holiday'].astype(str) + ' (' + entries['Country'] + ')'
+    by_date = entries.groupby('MonthDay', sort=False)['Entry'].agg(', '.join)
+
+    # Format as "Month DD | Holiday (Countries), ..."
+    days = [day_of_year(key // 100, key % 100) for key in by_date.index]
+    lines = [f"{calendar.month_name[key // 100]} {key % 100:02d} | {entry}" for key, entry in by_date.items()]
+    return days, lines
+
+
+def workbook_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def parse_workbook(path):
+    # pandas/openpyxl are only needed when there is no usable snapshot
+    import pandas as pd
+
+    # Read the Excel file
+    df = pd.read_excel(path)
+
+    # Ensure proper column names
+    df.columns = ['Country', 'Holiday', 'Date']
+
+    # Forward-fill empty country cells with the previous country
+    df['Country'] = df['Country'].ffill()
+
+    # Keep the weekday name, it is what pins down the workbook's year
+    df['Weekday'] = df['Date'].astype(str).str.split(',').str[0].str.strip()
+
+    # Convert the 'Date' column to datetime (accounting for the specific format)
+    df['Date'] = pd.to_datetime(df['Date'], format='%A, %B %d', errors='coerce')
+
+    # Drop rows where 'Date' could not be parsed
+    df = df.dropna(subset=['Date'])
+
+    # Integer month/day keys (e.g. 1225 for December 25) for filtering and sorting
+    df['Month'] = df['Date'].dt.month
+    df['Day'] = df['Date'].dt.day
+    df['MonthDay'] = df['Month'] * 100 + df['Day']
+
+    # Workbook position, used to keep holidays on the same date in file order
+    df = df.reset_index(drop=True)
+    df['Row'] = df.index
+
+    return df
+
+
+def write_snapshot(index, path=HOLIDAY_SNAPSHOT):
+    # Layout: magic, uint32 header length, JSON header (workbook digest and the
+    # interned string table), then one packed uint32 array per column
+    strings = sorted(set(index.countries) | set(index.holiday_names) | set(index.entries))
+    codes = {value: i for i, value in enumerate(strings)}
+    columns = {
+        "country": [codes[value] for value in index.countries],
+        "holiday": [codes[value] for value in index.holiday_names],
+        "month": index.months,
+        "day": index.days,
+        "day_ordinal": index.day_ordinals,
+        "entry": [codes[value] for value in index.entries],
+    }
+    header = json.dumps({
+        "digest": index.digest,
+        "byteorder": sys.byteorder,
+        "year": index.year,
+        "strings": strings,
+        "lengths": [len(columns[name]) for name in SNAPSHOT_COLUMNS],
+    }).encode("utf-8")
+    # Pad so the arrays start on a 4-byte boundary
+    header += b" " * (-(len(SNAPSHOT_MAGIC) + 4 + len(header)) % 4)
+
+    # Per process, so two workers rebuilding at once never write the same file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for name in SNAPSHOT_COLUMNS:
+            f.write(array("I", columns[name]).tobytes())
+    # Readers see either the old or the new snapshot, never a partial one
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(digest, mtime, path=HOLIDAY_SNAPSHOT):
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    # Anything truncated or malformed counts as no snapshot, so the workbook is parsed instead
+    try:
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            return None
+        offset = len(SNAPSHOT_MAGIC)
+        header_length = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        header = json.loads(data[offset:offset + header_length])
+        if header["digest"] != digest or header["byteorder"] != sys.byteorder:
+            return None
+        offset += header_length
+
+        # One value per holiday row in the first four columns, one per date in the last two
+        lengths = header["lengths"]
+        if (len(lengths) != len(SNAPSHOT_COLUMNS) or len(set(lengths[:4])) != 1 or lengths[4] != lengths[5]
+                or len(data) != offset + 4 * sum(lengths)):
+            return None
+
+        # Numeric columns stay as zero-copy views over the mapped file
+        values = memoryview(data)[offset:].cast("I")
+        columns = {}
+        start = 0
+        for name, length in zip(SNAPSHOT_COLUMNS, lengths):
+            columns[name] = values[start:start + length]
+            start += length
+
+        strings = header["strings"]
+        return HolidayIndex(
+            [strings[code] for code in columns["country"]],
+            [strings[code] for code in columns["holiday"]],
+            columns["month"],
+            columns["day"],
+            header["year"],
+            columns["day_ordinal"],
+            [strings[code] for code in columns["entry"]],
+            mtime,
+            digest,
+        )
+    except (struct.error, ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def snapshot_path(workbook):
+    return HOLIDAY_SNAPSHOT if workbook == HOLIDAY_WORKBOOK else workbook + ".idx"
+
+
+def build_index(path, mtime, digest):
+    index = load_snapshot(digest, mtime, snapshot_path(path))
+    if index is not None:
+        return index
+
+    # Snapshot missing or stale: fall back to the workbook and refresh the snapshot
+    index = HolidayIndex.from_frame(parse_workbook(path), mtime, digest)
+    try:
+        write_snapshot(index, snapshot_path(path))
+    except OSError:
+        pass
+    return index
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def get_holiday_index(path=HOLIDAY_WORKBOOK):
+    global _index
+    mtime = os.stat(path).st_mtime_ns
+    index = _index
+    if index is not None and index.mtime == mtime:
+        return index
+
+    with _lock:
+        index = _index
+        if index is not None and index.mtime == mtime:
+            return index
+
+        digest = workbook_digest(path)
+        if index is not None and index.digest == digest:
+            # Touched but not changed: keep the parsed data
+            index.mtime = mtime
+        else:
+            index = build_index(path, mtime, digest)
+        _index = index
+        return index
+
+
+if __name__ == "__main__":
+    # Build step: python holiday_index.py [workbook]
+    workbook = sys.argv[1] if len(sys.argv) > 1 else HOLIDAY_WORKBOOK
+    stat = os.stat(workbook)
+    built = HolidayIndex.from_frame(parse_workbook(workbook), stat.st_mtime_ns, workbook_digest(workbook))
+    write_snapshot(built, snapshot_path(workbook))
+    print(f"Wrote {snapshot_path(workbook)} ({len(built.countries)} holidays, {len(built.entries)} dates)")
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.auth import HTTPBasicAuth
+
+import jobs
+import scheduler
+import shared_cache
+import telemetry
+from circuit_breaker import CircuitBreaker
+
+# Every Jira call made by the backend goes through this module so the shared
+# rate budget applies to interactive requests and background work alike.
+JIRA_BASE_URL = os.getenv("JIRA_BASE_URL", "https://pingidentity.atlassian.net")
+JIRA_REQUESTS_PER_MINUTE = int(os.getenv("JIRA_REQUESTS_PER_MINUTE", "300"))
+# Share of the budget background work (cache warming, sync) may use
+JIRA_BACKGROUND_SHARE = float(os.getenv("JIRA_BACKGROUND_SHARE", "0.5"))
+JIRA_MAX_CONCURRENCY = int(os.getenv("JIRA_MAX_CONCURRENCY", "8"))
+JIRA_TIMEOUT_SECONDS = float(os.getenv("JIRA_TIMEOUT_SECONDS", "30"))
+# Search pages are shared across workers for a short while, so the same query
+# from another worker (or the warmer right after a request) costs no Jira call
+JIRA_PAGE_CACHE_TTL_SECONDS = float(os.getenv("JIRA_PAGE_CACHE_TTL_SECONDS", "300"))
+# Field definitions (names, types) rarely change
+JIRA_FIELD_CACHE_TTL_SECONDS = float(os.getenv("JIRA_FIELD_CACHE_TTL_SECONDS", "86400"))
+
+SEARCH_FIELDS = [
+    "customfield_10078",
+    "customfield_11020",
+    "customfield_11025",
+    "customfield_10112",
+    "summary",
+    "resolutiondate",
+    "updated",
+    "customfield_10262",
+    "status",
+    "customfield_10256",
+    "customfield_10241",
+    "customfield_10100",
+    "customfield_11291",
+    "customfield_11084",
+    "customfield_11404",
+    "customfield_11085"
+]
+
+class JiraUnavailableError(Exception):
+    pass
+
+
+class JiraCredentialsError(Exception):
+    pass
+
+
+class JiraRequestError(Exception):
+    # Jira answered but refused the request (expired token, no permission, bad JQL).
+    # Not an outage, so it does not count against the breaker.
+    def __init__(self, status_code, detail):
+        super().__init__(f"Jira returned HTTP {status_code}: {detail}")
+        self.status_code = status_code
+
+
+class RateBudget:
+    def __init__(self, per_minute, background_share):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.background_reserve = self.capacity * (1 - background_share)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, cls):
+        # Background callers leave the reserved part of the bucket to interactive requests
+        reserve = 0 if cls == scheduler.INTERACTIVE else self.background_reserve
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens - 1 >= reserve:
+                    self.tokens -= 1
+                    return
+                wait = (reserve + 1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+rate_budget = RateBudget(JIRA_REQUESTS_PER_MINUTE, JIRA_BACKGROUND_SHARE)
+jira_gate = scheduler.PriorityGate("jira", JIRA_MAX_CONCURRENCY)
+jira_breaker = CircuitBreaker("Jira")
+# Timeouts, connection errors, 429s and 5xxs count as Jira being unavailable
+JIRA_FAILURES = (requests.RequestException, JiraUnavailableError)
+page_cache = shared_cache.TieredCache("jira_pages", JIRA_PAGE_CACHE_TTL_SECONDS, max_entries=5000, local_entries=128)
+field_cache = shared_cache.TieredCache("jira_fields", JIRA_FIELD_CACHE_TTL_SECONDS, max_entries=10, local_entries=1)
+
+
+def auth():
+    # Credentials only come from the environment (or .env, loaded by the app after import)
+    user, token = os.getenv("JIRA_USER"), os.getenv("JIRA_TOKEN")
+    if not user or not token:
+        raise JiraCredentialsError("JIRA_USER and JIRA_TOKEN must be set to call Jira")
+    return HTTPBasicAuth(user, token)
+
+
+def check_response(response):
+    # Every non-2xx answer raises, so an error body is never read (or cached) as an empty result
+    if response.status_code == 429 or response.status_code >= 500:
+        raise JiraUnavailableError(f"Jira returned HTTP {response.status_code}")
+    if not 200 <= response.status_code < 300:
+        try:
+            body = response.json()
+            detail = "; ".join(body.get("errorMessages", [])) or json.dumps(body.get("errors", body))
+        except ValueError:
+            detail = response.text[:200]
+        raise JiraRequestError(response.status_code, detail)
+
+
+def record_response(endpoint, cls, response):
+    telemetry.jira_requests.inc(endpoint, cls)
+    telemetry.jira_response_bytes.inc(endpoint, amount=len(response.content))
+
+
+def fetch_issues_with_pagination(jql, start_at=0, max_results=50):
+    url = f"{JIRA_BASE_URL}/rest/api/3/search?_r=1734441761716"
+
+    payload = json.dumps({
+        "jql": jql,
+        "validateQuery": "warn",
+        "startAt": start_at,
+        "maxResults": max_results,
+        "fields": SEARCH_FIELDS,
+        "expand": [
+            "renderedFields"
+        ]
+    })
+
+    # A cached page spends no rate budget
+    page_key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    page = page_cache.get(page_key)
+    if page is not None:
+        return page["issues"], page["total"]
+
+    credentials = auth()
+    # Every page is scheduled on its own, so long background crawls yield to interactive work between pages
+    cls = scheduler.request_class.get()
+    rate_budget.acquire(cls)
+
+    headers = {
+        'Content-Type': 'application/json'
+    }
+
+    with jira_breaker.guard(JIRA_FAILURES), jira_gate.slot(cls):
+        with telemetry.jira_request_seconds.time("search"):
+            response = requests.post(url, headers=headers, data=payload, auth=credentials, timeout=JIRA_TIMEOUT_SECONDS)
+        record_response("search", cls, response)
+        check_response(response)
+    result = response.json()
+    jobs.record("jira_pages")
+    issues, total = result.get("issues", []), result.get("total", 0)
+    page_cache.put(page_key, {"issues": issues, "total": total})
+    return issues, total
+
+
+def fetch_all_issues(jql, max_results=50):
+    all_issues = []
+    start_at = 0
+    total_issues = 1  # Initialize with a non-zero value to enter the loop
+
+    while start_at < total_issues:
+        issues, total_issues = fetch_issues_with_pagination(jql, start_at, max_results)
+        all_issues.extend(issues)
+        start_at += max_results
+
+    return all_issues
+
+
+def fetch_issue_with_changelog(jira_id):
+    credentials = auth()
+    cls = scheduler.request_class.get()
+    rate_budget.acquire(cls)
+    url = f"{JIRA_BASE_URL}/rest/api/3/issue/{jira_id}?expand=changelog"
+    headers = {
+        'Content-Type': 'application/json',
+    }
+
+    with jira_breaker.guard(JIRA_FAILURES), jira_gate.slot(cls):
+        with telemetry.jira_request_seconds.time("changelog"):
+            response = requests.request("GET", url, headers=headers, data={}, auth=credentials, timeout=JIRA_TIMEOUT_SECONDS)
+        record_response("changelog", cls, response)
+        check_response(response)
+    jobs.record("changelogs")
+    return response.json()
+
+
+def fetch_fields():
+    # Id, name and schema of every Jira field, e.g. to match fields JQL names by their id
+    fields = field_cache.get("fields")
+    if fields is not None:
+        return fields
+
+    credentials = auth()
+    cls = scheduler.request_class.get()
+    rate_budget.acquire(cls)
+    url = f"{JIRA_BASE_URL}/rest/api/3/field"
+    headers = {
+        'Content-Type': 'application/json',
+    }
+
+    with jira_breaker.guard(JIRA_FAILURES), jira_gate.slot(cls):
+        with telemetry.jira_request_seconds.time("fields"):
+            response = requests.request("GET", url, headers=headers, auth=credentials, timeout=JIRA_TIMEOUT_SECONDS)
+        record_response("fields", cls, response)
+        check_response(response)
+    fields = response.json()
+    field_cache.put("fields", fields)
+    return fields
@@ -0,0 +1,110 @@
+import contextvars
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Report jobs: long reports run on a small worker pool instead of holding the
+# HTTP request open. Clients submit, then poll the job for progress and result.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+JOB_MAX_RETAINED = 200
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Progress counters reported by the Jira client and the LLM executor
+STAGES = ["jira_pages", "changelogs", "streams", "llm_calls"]
+
+# The job the current thread (and the threads it fans out to) is working for
+current_job = contextvars.ContextVar("current_job", default=None)
+
+
+class Job:
+    def __init__(self, kind, params):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = QUEUED
+        self.progress = {stage: 0 for stage in STAGES}
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.lock = threading.Lock()
+
+    def to_dict(self):
+        with self.lock:
+            job = {
+                "job_id": self.id,
+                "report": self.kind,
+                "params": self.params,
+                "status": self.status,
+                "progress": dict(self.progress),
+                "elapsed_seconds": round((self.finished or time.time()) - self.created, 2),
+            }
+        if self.status == DONE:
+            job["result"] = self.result
+        if self.status == FAILED:
+            job["error"] = self.error
+        return job
+
+
+def record(stage, count=1):
+    job = current_job.get()
+    if job is not None:
+        with job.lock:
+            job.progress[stage] += count
+
+
+_lock = threading.Lock()
+_jobs = {}
+_pool = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+
+
+def prune():
+    now = time.time()
+    with _lock:
+        finished = sorted((job for job in _jobs.values() if job.finished is not None), key=lambda job: job.finished)
+        for i, job in enumerate(finished):
+            if now - job.finished > JOB_RETENTION_SECONDS or len(finished) - i > JOB_MAX_RETAINED:
+                del _jobs[job.id]
+
+
+def run(job, compute):
+    current_job.set(job)
+    with job.lock:
+        job.status = RUNNING
+    try:
+        result = compute()
+        with job.lock:
+            job.result = result
+            job.status = DONE
+    except Exception as e:
+        with job.lock:
+            job.error = str(e)
+            job.status = FAILED
+    with job.lock:
+        job.finished = time.time()
+
+
+def submit(kind, params, compute):
+    # The same report submitted again reuses the running or retained job
+    prune()
+    with _lock:
+        for job in _jobs.values():
+            if job.kind == kind and job.params == params and job.status != FAILED:
+                return job
+        job = Job(kind, params)
+        _jobs[job.id] = job
+    _pool.submit(contextvars.copy_context().run, run, job, compute)
+    return job
+
+
+def get(job_id):
+    prune()
+    with _lock:
+        return _jobs.get(job_id)
@@ -0,0 +1,161 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import jobs
+import scheduler
+import telemetry
+from circuit_breaker import CircuitBreaker
+
+# Central place every OpenAI call goes through: caps concurrency, enforces a
+# deadline per call, retries transient failures and optionally hedges slow calls.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "90"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_HEDGE = os.getenv("LLM_HEDGE", "0") == "1"
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "8"))
+
+
+def transient_errors():
+    # The openai package is imported on the first LLM call rather than at worker start
+    import openai
+
+    return (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+class LLMQueueTimeoutError(TimeoutError):
+    # No slot freed up in time: OpenAI was never called, so the breaker ignores it
+    pass
+
+
+class LLMExecutor:
+    def __init__(self, create_client, max_concurrency=LLM_MAX_CONCURRENCY, deadline=LLM_DEADLINE_SECONDS,
+                 max_retries=LLM_MAX_RETRIES, hedge=LLM_HEDGE, hedge_after=LLM_HEDGE_AFTER_SECONDS):
+        # The OpenAI client is built when the first completion needs it
+        self.create_client = create_client
+        self.client = None
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.slots = scheduler.PriorityGate("openai", max_concurrency)
+        # Primary and hedge attempts each run on their own thread
+        self.pool = ThreadPoolExecutor(max_workers=max_concurrency * 2, thread_name_prefix="llm")
+        self.first_token_times = deque(maxlen=200)
+        self.lock = threading.Lock()
+        self.breaker = CircuitBreaker("OpenAI")
+
+    def get_client(self):
+        if self.client is None:
+            with self.lock:
+                if self.client is None:
+                    self.client = self.create_client()
+        return self.client
+
+    def hedge_delay(self):
+        # p95 of observed time-to-first-token once there is enough history
+        with self.lock:
+            samples = sorted(self.first_token_times)
+        if len(samples) < 20:
+            return self.hedge_after
+        return samples[int(len(samples) * 0.95) - 1]
+
+    def run_attempt(self, request, deadline_at, first_token, cancelled, cls):
+        # Returns the text and the token usage the final chunk reports
+        started = time.monotonic()
+        try:
+            stream = self.get_client().with_options(timeout=max(deadline_at - started, 0.1), max_retries=0) \
+                .chat.completions.create(stream=True, stream_options={"include_usage": True}, **request)
+            parts = []
+            usage = None
+            for chunk in stream:
+                if cancelled.is_set():
+                    stream.close()
+                    return None, None
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    if not first_token.is_set():
+                        first_token.set()
+                        with self.lock:
+                            self.first_token_times.append(time.monotonic() - started)
+                    parts.append(content)
+            return "".join(parts).strip(), usage
+        finally:
+            # A finished attempt no longer needs a hedge either way
+            first_token.set()
+            self.slots.release(cls)
+
+    def attempt(self, request, deadline_at):
+        cls = scheduler.request_class.get()
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0 or not self.slots.acquire(cls, timeout=remaining):
+            raise LLMQueueTimeoutError("Timed out waiting for an LLM slot")
+
+        first_token = threading.Event()
+        cancelled = threading.Event()
+        futures = [self.pool.submit(self.run_attempt, request, deadline_at, first_token, cancelled, cls)]
+
+        # Fire a duplicate request if the first one has not produced tokens in time,
+        # but only when a slot is free so hedging never queues behind real work
+        if self.hedge and not first_token.wait(min(self.hedge_delay(), max(deadline_at - time.monotonic(), 0))):
+            if not futures[0].done() and self.slots.acquire(cls, timeout=0):
+                futures.append(self.pool.submit(self.run_attempt, request, deadline_at, threading.Event(), cancelled, cls))
+
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=max(deadline_at - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    cancelled.set()
+                    return future.result()
+                error = future.exception()
+
+        cancelled.set()
+        if error is not None and not pending:
+            raise error
+        raise LLMTimeoutError(f"LLM call exceeded its {self.deadline:g}s deadline")
+
+    def complete(self, messages, model, temperature=0.3, endpoint="other"):
+        # endpoint labels the latency and token metrics with the report the call serves
+        request = {"messages": messages, "model": model, "temperature": temperature}
+        started = time.monotonic()
+        deadline_at = started + self.deadline
+        transient = transient_errors()
+        # Failures that count as OpenAI being unavailable: only attempts that reached it
+        upstream_failures = transient + (LLMTimeoutError,)
+
+        for retry in range(self.max_retries + 1):
+            try:
+                # Raises CircuitOpenError without calling OpenAI while the circuit is open
+                with self.breaker.guard(upstream_failures, skipped=(LLMQueueTimeoutError,)):
+                    result, usage = self.attempt(request, deadline_at)
+                jobs.record("llm_calls")
+                telemetry.openai_request_seconds.observe(time.monotonic() - started, endpoint, model)
+                if usage is not None:
+                    telemetry.openai_tokens.inc(endpoint, model, "prompt", amount=usage.prompt_tokens)
+                    telemetry.openai_tokens.inc(endpoint, model, "completion", amount=usage.completion_tokens)
+                return result
+            except transient:
+                backoff = min(2 ** retry, 10) * (0.5 + random.random() / 2)
+                if retry == self.max_retries or time.monotonic() + backoff >= deadline_at:
+                    raise
+                time.sleep(backoff)
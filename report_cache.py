@@ -0,0 +1,162 @@
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import scheduler
+import telemetry
+
+# Finished report results (the dicts and lists the report functions return), keyed
+# by (report, stream, fromDate, toDate). Filled by requests and the cache warmer.
+REPORT_CACHE_TTL_SECONDS = float(os.getenv("REPORT_CACHE_TTL_SECONDS", "3600"))
+# How long an expired result may still be served while it is being refreshed
+REPORT_CACHE_MAX_STALE_SECONDS = float(os.getenv("REPORT_CACHE_MAX_STALE_SECONDS", str(7 * 86400)))
+# Results kept per worker; the least recently used go first
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "1000"))
+
+HIT = "HIT"
+MISS = "MISS"
+STALE = "STALE"
+
+_lock = threading.Lock()
+# key -> (value, stored_at, version), most recently used last
+_entries = OrderedDict()
+_in_flight = {}
+# Stored times of the cached results a refresh's computation read (the streams
+# of an "All" report): the new result is only as fresh as the oldest of them
+_inputs = contextvars.ContextVar("report_cache_inputs", default=None)
+
+
+def record_input(stored_at):
+    inputs = _inputs.get()
+    if inputs is not None:
+        inputs.append(stored_at)
+
+
+def lookup(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+    return entry
+
+
+def get(key, max_age=REPORT_CACHE_TTL_SECONDS):
+    entry = lookup(key)
+    if entry is None or time.time() - entry[1] > max_age:
+        return None
+    record_input(entry[1])
+    return entry[0]
+
+
+def version_of(value):
+    # Derived from the content, so every worker (and a restarted one) gives the
+    # same result the same ETag, and a refresh that changes nothing keeps it
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def put(key, value, stored_at=None):
+    version = version_of(value)
+    now = time.time()
+    stored_at = now if stored_at is None else stored_at
+    with _lock:
+        _entries[key] = (value, stored_at, version)
+        _entries.move_to_end(key)
+        # Results too old to serve even stale are dropped, then the least recently used over the cap
+        for expired in [old for old, entry in _entries.items() if now - entry[1] > REPORT_CACHE_MAX_STALE_SECONDS]:
+            del _entries[expired]
+        while len(_entries) > REPORT_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return stored_at
+
+
+def etag(key, version):
+    return '"' + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12] + "-" + version + '"'
+
+
+def peek(key):
+    # (etag, age, HIT/STALE) of the result serve() would return right now, without computing
+    entry = lookup(key)
+    if entry is None:
+        return None
+    age = time.time() - entry[1]
+    if age > REPORT_CACHE_MAX_STALE_SECONDS:
+        return None
+    return etag(key, entry[2]), age, HIT if age <= REPORT_CACHE_TTL_SECONDS else STALE
+
+
+def refresh(key, compute):
+    # Only one computation per key at a time; concurrent callers wait for it
+    with _lock:
+        done = _in_flight.get(key)
+        if done is None:
+            done = _in_flight[key] = threading.Event()
+            owner = True
+        else:
+            owner = False
+
+    if not owner:
+        done.wait()
+        value = get(key)
+        if value is not None:
+            return value
+        return compute()
+
+    try:
+        inputs = []
+        token = _inputs.set(inputs)
+        try:
+            value = compute()
+        finally:
+            _inputs.reset(token)
+        record_input(put(key, value, min(inputs, default=None)))
+        return value
+    finally:
+        with _lock:
+            del _in_flight[key]
+        done.set()
+
+
+def revalidate(key, compute):
+    # Background refresh of an expired entry; a refresh already running covers it
+    with _lock:
+        if key in _in_flight:
+            return
+
+    def run():
+        scheduler.request_class.set(scheduler.WARMUP)
+        try:
+            refresh(key, compute)
+        except Exception as e:
+            print(f"Revalidating {key} failed: {e}")
+
+    threading.Thread(target=run, name="report-revalidate", daemon=True).start()
+
+
+def serve(key, compute):
+    # Stale-while-revalidate: returns (value, age in seconds, HIT/MISS/STALE, etag).
+    # An expired entry is returned immediately and refreshed in the background,
+    # so a slow or failing upstream never holds up a result that exists.
+    entry = lookup(key)
+    if entry is not None:
+        age = time.time() - entry[1]
+        if age <= REPORT_CACHE_TTL_SECONDS:
+            telemetry.cache_requests.inc("reports", "hit")
+            return entry[0], age, HIT, etag(key, entry[2])
+        if age <= REPORT_CACHE_MAX_STALE_SECONDS:
+            telemetry.cache_requests.inc("reports", "stale")
+            revalidate(key, compute)
+            return entry[0], age, STALE, etag(key, entry[2])
+
+    telemetry.cache_requests.inc("reports", "miss")
+    value = refresh(key, compute)
+    with _lock:
+        entry = _entries.get(key)
+    if entry is None or entry[0] is not value:
+        return value, 0, MISS, None
+    # Not necessarily 0: a result built from cached parts is as old as the oldest part
+    return value, max(0, time.time() - entry[1]), MISS, etag(key, entry[2])
@@ -0,0 +1,94 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Outbound Jira and OpenAI calls are tagged with the class of work they serve.
+# When capacity is short, a free slot always goes to the highest-priority
+# waiter, so a user waiting on the dashboard never queues behind background work.
+INTERACTIVE = "interactive"
+WARMUP = "warmup"
+SYNC = "sync"
+CLASSES = [INTERACTIVE, WARMUP, SYNC]
+
+request_class = contextvars.ContextVar("request_class", default=INTERACTIVE)
+
+
+class PriorityGate:
+    def __init__(self, name, capacity):
+        self.name = name
+        self.capacity = capacity
+        self.available = capacity
+        self.cond = threading.Condition()
+        self.waiting = {cls: deque() for cls in CLASSES}
+        self.in_flight = {cls: 0 for cls in CLASSES}
+        self.acquired = {cls: 0 for cls in CLASSES}
+        self.total_wait = {cls: 0.0 for cls in CLASSES}
+        self.max_wait = {cls: 0.0 for cls in CLASSES}
+
+    def next_in_line(self):
+        for cls in CLASSES:
+            if self.waiting[cls]:
+                return self.waiting[cls][0]
+        return None
+
+    def acquire(self, cls=None, timeout=None):
+        cls = cls or request_class.get()
+        ticket = object()
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+
+        with self.cond:
+            self.waiting[cls].append(ticket)
+            try:
+                # Lower classes only get a slot once no higher class is waiting
+                while not (self.available > 0 and self.next_in_line() is ticket):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self.cond.wait(remaining)
+
+                self.available -= 1
+                waited = time.monotonic() - started
+                self.in_flight[cls] += 1
+                self.acquired[cls] += 1
+                self.total_wait[cls] += waited
+                self.max_wait[cls] = max(self.max_wait[cls], waited)
+                return True
+            finally:
+                self.waiting[cls].remove(ticket)
+                self.cond.notify_all()
+
+    def release(self, cls=None):
+        cls = cls or request_class.get()
+        with self.cond:
+            self.available += 1
+            self.in_flight[cls] -= 1
+            self.cond.notify_all()
+
+    @contextmanager
+    def slot(self, cls=None):
+        cls = cls or request_class.get()
+        self.acquire(cls)
+        try:
+            yield
+        finally:
+            self.release(cls)
+
+    def stats(self):
+        with self.cond:
+            return {
+                "capacity": self.capacity,
+                "available": self.available,
+                "classes": {
+                    cls: {
+                        "queued": len(self.waiting[cls]),
+                        "in_flight": self.in_flight[cls],
+                        "acquired": self.acquired[cls],
+                        "avg_wait_seconds": round(self.total_wait[cls] / self.acquired[cls], 4) if self.acquired[cls] else 0,
+                        "max_wait_seconds": round(self.max_wait[cls], 4),
+                    }
+                    for cls in CLASSES
+                },
+            }
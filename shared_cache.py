@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import telemetry
+
+# Two-tier cache for data every uvicorn worker needs: a small in-process LRU in
+# front of a store all workers on the host share, so a Jira page or summary
+# fetched by one worker is a hit in the others instead of a cold miss per worker.
+# Backends only need get/put/prune on (namespace, key) with JSON-ready values.
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "sqlite")
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", ".shared_cache.sqlite3")
+SHARED_CACHE_PRUNE_EVERY = 100
+
+
+class MemoryBackend:
+    # Single-process deployments and local runs: nothing is shared across workers
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, namespace, key):
+        with self.lock:
+            return self.entries.get((namespace, key))
+
+    def put(self, namespace, key, value, stored_at):
+        with self.lock:
+            self.entries[(namespace, key)] = (value, stored_at)
+
+    def prune(self, namespace, max_entries, ttl):
+        with self.lock:
+            now = time.time()
+            keys = sorted((entry[1], key) for (ns, key), entry in self.entries.items() if ns == namespace)
+            for i, (stored_at, key) in enumerate(keys):
+                if (ttl is not None and now - stored_at > ttl) or len(keys) - i > max_entries:
+                    del self.entries[(namespace, key)]
+
+
+class SQLiteBackend:
+    # One file next to the app; WAL lets every worker read while one writes
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (namespace TEXT, key TEXT, value TEXT, stored_at REAL, "
+                "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_age ON entries (namespace, stored_at)")
+            self.local.conn = conn
+        return conn
+
+    def get(self, namespace, key):
+        row = self.connection().execute(
+            "SELECT value, stored_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, namespace, key, value, stored_at):
+        self.connection().execute(
+            "INSERT OR REPLACE INTO entries (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), stored_at),
+        )
+
+    def prune(self, namespace, max_entries, ttl):
+        conn = self.connection()
+        if ttl is not None:
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND stored_at < ?", (namespace, time.time() - ttl))
+        conn.execute(
+            "DELETE FROM entries WHERE namespace = ? AND key NOT IN "
+            "(SELECT key FROM entries WHERE namespace = ? ORDER BY stored_at DESC LIMIT ?)",
+            (namespace, namespace, max_entries),
+        )
+
+
+def create_backend(name=SHARED_CACHE_BACKEND):
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend(SHARED_CACHE_PATH)
+    raise ValueError(f"Unknown SHARED_CACHE_BACKEND {name!r}")
+
+
+shared_backend = create_backend()
+
+
+class TieredCache:
+    def __init__(self, namespace, ttl=None, max_entries=10000, local_entries=256, backend=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.local_entries = local_entries
+        self.backend = backend or shared_backend
+        self.lock = threading.Lock()
+        # key -> (value, stored_at), most recently used last
+        self.local = OrderedDict()
+        self.puts = 0
+
+    def fresh(self, stored_at):
+        return self.ttl is None or time.time() - stored_at <= self.ttl
+
+    def remember(self, key, value, stored_at):
+        with self.lock:
+            self.local[key] = (value, stored_at)
+            self.local.move_to_end(key)
+            while len(self.local) > self.local_entries:
+                self.local.popitem(last=False)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.local.get(key)
+            if entry is not None and self.fresh(entry[1]):
+                self.local.move_to_end(key)
+                telemetry.cache_requests.inc(self.namespace, "local_hit")
+                return entry[0]
+
+        # The shared tier is best effort: if it is locked or unreadable the caller just fetches
+        try:
+            entry = self.backend.get(self.namespace, key)
+        except (sqlite3.Error, ValueError):
+            entry = None
+        if entry is None or not self.fresh(entry[1]):
+            telemetry.cache_requests.inc(self.namespace, "miss")
+            return None
+
+        # Keep the shared timestamp so the local copy expires with it
+        self.remember(key, entry[0], entry[1])
+        telemetry.cache_requests.inc(self.namespace, "shared_hit")
+        return entry[0]
+
+    def put(self, key, value):
+        stored_at = time.time()
+        self.remember(key, value, stored_at)
+        with self.lock:
+            self.puts += 1
+            prune = self.puts % SHARED_CACHE_PRUNE_EVERY == 0
+        try:
+            self.backend.put(self.namespace, key, value, stored_at)
+            if prune:
+                self.backend.prune(self.namespace, self.max_entries, self.ttl)
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+import threading
+
+import shared_cache
+
+# Stored LLM summaries keyed by a fingerprint of the prompt that produced them.
+# Kept in the shared cache tier so every worker reuses them and they survive restarts.
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "500"))
+# Summaries written by earlier versions, imported into the shared tier once
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", ".summary_cache.json")
+
+_lock = threading.Lock()
+_summaries = shared_cache.TieredCache("llm_summaries", max_entries=SUMMARY_CACHE_MAX_ENTRIES, local_entries=SUMMARY_CACHE_MAX_ENTRIES)
+_migrated = False
+
+
+def fingerprint(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def _migrate():
+    global _migrated
+    with _lock:
+        if _migrated:
+            return
+        _migrated = True
+        try:
+            with open(SUMMARY_CACHE_PATH, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, entry in legacy.items():
+            if _summaries.get(key) is None:
+                _summaries.put(key, entry["summary"])
+        try:
+            os.replace(SUMMARY_CACHE_PATH, SUMMARY_CACHE_PATH + ".migrated")
+        except OSError:
+            pass
+
+
+def get_summary(key):
+    _migrate()
+    return _summaries.get(key)
+
+
+def store_summary(key, summary):
+    _migrate()
+    _summaries.put(key, summary)
@@ -0,0 +1,116 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Counters and histograms for Jira, OpenAI and the caches, rendered in the
+# Prometheus text format by /internal/metrics. Values are per worker process.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+_registry = []
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{name}="{escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.lock = threading.Lock()
+        self.values = {}
+        _registry.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # labels -> [count per bucket (not cumulative), sum, count]
+        self.values = {}
+        _registry.append(self)
+
+    def observe(self, value, *labels):
+        with self.lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = format_labels(self.labels, labels, [("le", format_value(float(bound)))])
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(total)}")
+                lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {count}")
+        return lines
+
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+jira_requests = Counter(
+    "pingpulse_jira_requests_total", "Jira REST calls made, by endpoint (search page or changelog) and request class",
+    ("endpoint", "request_class"))
+jira_response_bytes = Counter(
+    "pingpulse_jira_response_bytes_total", "Bytes received from Jira", ("endpoint",))
+jira_request_seconds = Histogram(
+    "pingpulse_jira_request_seconds", "Latency of Jira REST calls", ("endpoint",))
+stream_fetch_seconds = Histogram(
+    "pingpulse_stream_fetch_seconds", "Time to fetch one product stream's epics for a report", ("report", "stream"))
+openai_request_seconds = Histogram(
+    "pingpulse_openai_request_seconds", "Latency of LLM completions, retries included", ("endpoint", "model"))
+openai_tokens = Counter(
+    "pingpulse_openai_tokens_total", "Tokens used by LLM completions, by type (prompt or completion)",
+    ("endpoint", "model", "type"))
+cache_requests = Counter(
+    "pingpulse_cache_requests_total", "Cache lookups by cache and result (hit tier, stale or miss)", ("cache", "result"))
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def holidays():
+    # A small parsed workbook: two countries sharing a date, stray whitespace
+    # in a country name, and a Feb 29 holiday
+    from holiday_index import HolidayIndex, day_of_year
+
+    return HolidayIndex(
+        ["United States", "India ", "United States", "India ", "Leapland"],
+        ["New Year's Day", "New Year's Day", "Independence Day", "Diwali", "Leap Day"],
+        [1, 1, 7, 10, 2],
+        [1, 1, 4, 20, 29],
+        2025,
+        [day_of_year(1, 1), day_of_year(2, 29), day_of_year(7, 4), day_of_year(10, 20)],
+        ["January 01 | New Year's Day (India, United States)", "February 29 | Leap Day (Leapland)",
+         "July 04 | Independence Day (United States)", "October 20 | Diwali (India)"],
+        123,
+        "digest",
+    )
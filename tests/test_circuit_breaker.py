@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def fail(breaker):
+    with pytest.raises(IOError):
+        with breaker.guard((IOError,)):
+            raise IOError("down")
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("upstream", failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        fail(breaker)
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError) as error:
+        with breaker.guard((IOError,)):
+            pass
+    assert error.value.retry_after == pytest.approx(30)
+
+
+def test_other_exceptions_count_as_success(clock):
+    breaker = CircuitBreaker("upstream", failure_threshold=2, reset_timeout=30)
+    fail(breaker)
+    with pytest.raises(KeyError):
+        with breaker.guard((IOError,)):
+            raise KeyError("bad payload")
+    fail(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_one_trial_that_closes_the_circuit(clock):
+    breaker = CircuitBreaker("upstream", failure_threshold=1, reset_timeout=30)
+    fail(breaker)
+    clock.now += 31
+
+    with breaker.guard((IOError,)):
+        assert breaker.state == HALF_OPEN
+        # Everyone else keeps failing fast while the trial runs
+        with pytest.raises(CircuitOpenError):
+            breaker.before()
+    assert breaker.state == CLOSED
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("upstream", failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        fail(breaker)
+    clock.now += 31
+    fail(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+
+
+def test_skipped_call_frees_the_half_open_trial(clock):
+    breaker = CircuitBreaker("upstream", failure_threshold=1, reset_timeout=30)
+    fail(breaker)
+    clock.now += 31
+
+    with pytest.raises(TimeoutError):
+        with breaker.guard((IOError,), skipped=(TimeoutError,)):
+            raise TimeoutError("no slot")
+    assert breaker.state == HALF_OPEN
+    # The next caller gets the trial instead of failing fast
+    with breaker.guard((IOError,)):
+        pass
+    assert breaker.state == CLOSED
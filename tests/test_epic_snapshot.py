@@ -0,0 +1,60 @@
+import pytest
+
+import epic_snapshot
+import window_cache
+from business_calendar import BusinessCalendar
+
+
+def epic(resolved, created, on_track, response, days, in_progress=None, closed=None, days_in_progress=None):
+    return {
+        "Resolved_Date": resolved,
+        "Created_Date": created,
+        "InProgress_Date": in_progress,
+        "Closed_Date": closed,
+        "OnTrack_Status": on_track,
+        "Engineering_Response": response,
+        "Days from Created to Resolved": days,
+        "Days from In Progress to Closed": days_in_progress,
+    }
+
+
+def test_epic_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "epics.bin")
+    records = {
+        "Alpha": [
+            # Resolved out of order; the snapshot sorts each stream by resolution minute
+            epic("2025-03-10T10:00:00.000+0000", "2025-03-07T09:00:00.000+0000", "At Risk", "Best Effort", 3),
+            epic("2025-03-05T10:00:00.000+0000", "2025-03-03T09:00:00.000+0000", "Blue (Complete)", "Committed", 2,
+                 "2025-03-04T09:00:00.000+0000", "2025-03-05T10:00:00.000+0000", 1),
+            epic(None, "2025-03-03T09:00:00.000+0000", "In Progress", "Committed", 0),
+        ],
+        "Beta": [
+            epic("2025-03-06T10:00:00.000+0000", "2025-03-01T09:00:00.000+0000", "Not Started", "Stretch", 5),
+        ],
+    }
+    start = window_cache.to_minute("2025-03-01 00:00")
+    end = window_cache.to_minute("2025-04-01 00:00")
+    epic_snapshot.write_snapshot(records, start, end, path)
+
+    snapshot = epic_snapshot.load_snapshot(path, "key")
+    calendar = BusinessCalendar([])
+    assert snapshot.streams == ["Alpha", "Beta"]
+    assert snapshot.statistics("Alpha", start, end, calendar) == [2, 1, 0, 1, 0, 0, 50.0, 2.5, 0.5, 1.5, 0.5]
+    assert snapshot.statistics("Beta", start, end, calendar) == [1, 0, 0, 0, 0, 1, 100.0, 5.0, 0.0, 3.0, 0.0]
+
+    # Only the epic resolved on 2025-03-10 falls in the narrower window
+    narrow = window_cache.to_minute("2025-03-06 00:00")
+    assert snapshot.statistics("Alpha", narrow, end, calendar) == [1, 0, 0, 1, 0, 0, 0.0, 3.0, 0.0, 1.0, 0.0]
+    assert snapshot.statistics("Alpha", end, end + 60, calendar) == []
+    # Windows starting before the snapshot are computed live
+    assert snapshot.statistics("Alpha", start - 1, end, calendar) is None
+
+
+@pytest.mark.parametrize("keep", [0, 5, 20, -4, -1])
+def test_truncated_epic_snapshot_is_ignored(tmp_path, keep):
+    path = tmp_path / "epics.bin"
+    record = epic("2025-03-05T10:00:00.000+0000", "2025-03-03T09:00:00.000+0000", "At Risk", "Committed", 2)
+    epic_snapshot.write_snapshot({"Alpha": [record]}, 0, 10 ** 8, str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:keep] if keep >= 0 else data[:len(data) + keep])
+    assert epic_snapshot.load_snapshot(str(path), "key") is None
@@ -0,0 +1,51 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from business_calendar import BusinessCalendar
+
+
+def dates(entries):
+    return [(entry["date"], entry["holiday"]) for entry in entries]
+
+
+def test_lookup_projects_holidays_onto_requested_year(holidays):
+    assert dates(holidays.lookup("2026-01-01", "2026-12-31", "united states")) == [
+        ("2026-01-01", "New Year's Day"), ("2026-07-04", "Independence Day")]
+    assert holidays.lookup("2026-01-01", "2026-01-01")[0]["countries"] == ["India", "United States"]
+
+
+def test_lookup_spans_several_years(holidays):
+    assert dates(holidays.lookup("2025-10-01", "2027-01-01", "India")) == [
+        ("2025-10-20", "Diwali"), ("2026-01-01", "New Year's Day"), ("2026-10-20", "Diwali"),
+        ("2027-01-01", "New Year's Day")]
+    assert dates(holidays.lookup("2024-01-01", "2026-12-31", "India", year=2026)) == [
+        ("2026-01-01", "New Year's Day"), ("2026-10-20", "Diwali")]
+
+
+def test_lookup_reads_wrapped_range_like_between(holidays):
+    assert dates(holidays.lookup("2025-10-01", "2025-02-15", "India")) == [
+        ("2025-10-20", "Diwali"), ("2026-01-01", "New Year's Day")]
+
+
+def test_leap_day_only_in_leap_years(holidays):
+    assert holidays.lookup("2027-01-01", "2027-12-31", "Leapland") == []
+    assert dates(holidays.lookup("2027-01-01", "2028-12-31", "Leapland")) == [("2028-02-29", "Leap Day")]
+
+
+@pytest.mark.parametrize("from_date,to_date", [
+    ("2025-01-01", "2025-12-31"), ("2026-06-01", "2026-12-31"), ("2025-10-01", "2025-02-15"), ("2030-01-01", "2031-12-31"),
+])
+def test_country_filter_never_drops_holidays_of_that_country(holidays, from_date, to_date):
+    everyone = holidays.lookup(from_date, to_date)
+    for country in ("United States", "India", "Leapland"):
+        expected = [(entry["date"], entry["holiday"]) for entry in everyone if country in entry["countries"]]
+        assert dates(holidays.lookup(from_date, to_date, country)) == expected
+
+
+def test_business_calendar_skips_holidays_in_every_year(holidays):
+    calendar = BusinessCalendar(holidays.holiday_ordinals("United States", 2000, 2040))
+    # Jul 1 to Jul 7 holds five weekdays; Jul 4 is one of them in 2024 and 2025, a Saturday in 2026
+    starts = np.array([float(date(year, 7, 1).toordinal()) for year in (2024, 2025, 2026)])
+    assert calendar.business_days_between(starts, starts + 7).tolist() == [4, 4, 5]
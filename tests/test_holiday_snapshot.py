@@ -0,0 +1,44 @@
+import pytest
+
+import holiday_index
+
+
+def test_holiday_snapshot_round_trip(tmp_path, holidays):
+    path = str(tmp_path / "holidays.idx")
+    holiday_index.write_snapshot(holidays, path)
+
+    loaded = holiday_index.load_snapshot("digest", 123, path)
+    assert loaded.countries == holidays.countries
+    assert loaded.holiday_names == holidays.holiday_names
+    assert list(loaded.months) == holidays.months
+    assert list(loaded.days) == holidays.days
+    assert loaded.year == 2025
+    assert loaded.between("2025-10-01", "2025-02-15") == holidays.between("2025-10-01", "2025-02-15")
+    assert loaded.lookup("2025-01-01", "2026-12-31", "india") == holidays.lookup("2025-01-01", "2026-12-31", "india")
+
+
+def test_holiday_snapshot_of_another_workbook_is_ignored(tmp_path, holidays):
+    path = str(tmp_path / "holidays.idx")
+    holiday_index.write_snapshot(holidays, path)
+    assert holiday_index.load_snapshot("other digest", 123, path) is None
+    assert holiday_index.load_snapshot("digest", 123, str(tmp_path / "missing.idx")) is None
+
+
+@pytest.mark.parametrize("keep", [0, 5, 20, -4, -1])
+def test_truncated_holiday_snapshot_is_ignored(tmp_path, holidays, keep):
+    path = tmp_path / "holidays.idx"
+    holiday_index.write_snapshot(holidays, str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:keep] if keep >= 0 else data[:len(data) + keep])
+    assert holiday_index.load_snapshot("digest", 123, str(path)) is None
+
+
+def test_holiday_snapshot_with_inconsistent_lengths_is_ignored(tmp_path, holidays):
+    path = tmp_path / "holidays.idx"
+    holiday_index.write_snapshot(holidays, str(path))
+    data = path.read_bytes()
+    # Same total size, but one column claims a row the others lack
+    tampered = data.replace(b'"lengths": [5, 5, 5, 5, 4, 4]', b'"lengths": [6, 5, 5, 5, 4, 3]')
+    assert tampered != data
+    path.write_bytes(tampered)
+    assert holiday_index.load_snapshot("digest", 123, str(path)) is None
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import backend
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    backend.comment_text_cache.clear()
+    yield
+    backend.comment_text_cache.clear()
+
+
+def test_blocks_become_separated_sentences():
+    rendered = "<p>Waiting on <b>QA</b></p><ul><li>Fix &amp; retest</li><li>Ship.</li></ul><p>Next week</p>"
+    assert backend.html_to_text("A-1", rendered) == "Waiting on QA; Fix & retest; Ship. Next week"
+
+
+def test_line_breaks_and_whitespace_collapse():
+    assert backend.html_to_text("A-1", "On   track<br/>\n  <br>  since Monday") == "On track; since Monday"
+
+
+def test_empty_comment():
+    assert backend.html_to_text("A-1", None) == ""
+    assert backend.html_to_text("A-1", "") == ""
+
+
+def test_long_comment_is_cut_at_a_word(monkeypatch):
+    monkeypatch.setattr(backend, "ON_TRACK_COMMENT_MAX_CHARS", 12)
+    assert backend.html_to_text("A-1", "<p>alpha beta gamma delta</p>") == "alpha beta..."
+
+
+def test_cache_keeps_recently_used_entries(monkeypatch):
+    monkeypatch.setattr(backend, "COMMENT_TEXT_CACHE_SIZE", 2)
+    backend.html_to_text("A-1", "one")
+    backend.html_to_text("A-2", "two")
+    backend.html_to_text("A-1", "one")
+    backend.html_to_text("A-3", "three")
+    assert [key for key, _ in backend.comment_text_cache] == ["A-1", "A-3"]
+
+
+def test_concurrent_eviction(monkeypatch):
+    monkeypatch.setattr(backend, "COMMENT_TEXT_CACHE_SIZE", 8)
+
+    def convert(n):
+        return backend.html_to_text(f"A-{n}", f"<p>comment {n}</p>")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        texts = list(pool.map(convert, range(2000)))
+    assert texts == [f"comment {n}" for n in range(2000)]
+    assert len(backend.comment_text_cache) <= 8
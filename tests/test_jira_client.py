@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pytest
+
+import jira_client
+import shared_cache
+from circuit_breaker import CLOSED, CircuitBreaker
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+        self.content = b"{}"
+        self.text = str(body)
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    monkeypatch.setenv("JIRA_USER", "user@example.com")
+    monkeypatch.setenv("JIRA_TOKEN", "token")
+    monkeypatch.setattr(jira_client, "page_cache", shared_cache.TieredCache("jira_pages", 300, backend=shared_cache.MemoryBackend()))
+    monkeypatch.setattr(jira_client, "jira_breaker", CircuitBreaker("Jira", failure_threshold=5, reset_timeout=30))
+    fake = SimpleNamespace(responses=[], calls=0)
+
+    def respond(*args, **kwargs):
+        fake.calls += 1
+        return fake.responses.pop(0)
+
+    monkeypatch.setattr(jira_client.requests, "post", respond)
+    monkeypatch.setattr(jira_client.requests, "request", respond)
+    return fake
+
+
+def test_client_error_raises_without_tripping_the_breaker(jira):
+    jira.responses = [FakeResponse(401, {"errorMessages": ["Unauthorized"]}), FakeResponse(200, {"issues": [{"key": "A-1"}], "total": 1})]
+    with pytest.raises(jira_client.JiraRequestError) as error:
+        jira_client.fetch_issues_with_pagination("project = A")
+    assert error.value.status_code == 401
+    assert "Unauthorized" in str(error.value)
+    assert jira_client.jira_breaker.state == CLOSED
+    assert jira_client.jira_breaker.failures == 0
+
+    # The error body was not cached as an empty page
+    assert jira_client.fetch_issues_with_pagination("project = A") == ([{"key": "A-1"}], 1)
+    assert jira.calls == 2
+
+
+def test_upstream_errors_count_against_the_breaker(jira):
+    jira.responses = [FakeResponse(503, {}), FakeResponse(429, {})]
+    for _ in range(2):
+        with pytest.raises(jira_client.JiraUnavailableError):
+            jira_client.fetch_issues_with_pagination("project = A")
+    assert jira_client.jira_breaker.failures == 2
+
+
+def test_successful_pages_are_cached(jira):
+    jira.responses = [FakeResponse(200, {"issues": [], "total": 0})]
+    assert jira_client.fetch_issues_with_pagination("project = A") == ([], 0)
+    assert jira_client.fetch_issues_with_pagination("project = A") == ([], 0)
+    assert jira.calls == 1
+
+
+def test_changelog_client_error_raises(jira):
+    jira.responses = [FakeResponse(404, {"errorMessages": ["Issue does not exist"]})]
+    with pytest.raises(jira_client.JiraRequestError):
+        jira_client.fetch_issue_with_changelog("A-404")
+    assert jira_client.jira_breaker.failures == 0
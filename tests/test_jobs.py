@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+import jobs
+
+
+@pytest.fixture(autouse=True)
+def no_jobs():
+    jobs._jobs.clear()
+    yield
+    jobs._jobs.clear()
+
+
+def wait_finished(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while job.finished is None:
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return job.to_dict()
+
+
+def test_job_runs_and_reports_its_result():
+    release = threading.Event()
+    job = jobs.submit("metrics", {"stream": "IAM"}, lambda: release.wait(5) and {"IAM": [1]})
+    assert job.to_dict()["status"] in (jobs.QUEUED, jobs.RUNNING)
+    assert "result" not in job.to_dict()
+
+    release.set()
+    state = wait_finished(job)
+    assert state["status"] == jobs.DONE
+    assert state["result"] == {"IAM": [1]}
+    assert state["report"] == "metrics"
+    assert jobs.get(job.id) is job
+
+
+def test_same_report_reuses_the_job():
+    release = threading.Event()
+    first = jobs.submit("metrics", {"stream": "IAM"}, lambda: release.wait(5))
+    assert jobs.submit("metrics", {"stream": "IAM"}, lambda: None) is first
+    assert jobs.submit("metrics", {"stream": "P1AS"}, lambda: None) is not first
+    assert jobs.submit("risk", {"stream": "IAM"}, lambda: None) is not first
+    release.set()
+    wait_finished(first)
+    # A finished job is reused while it is retained
+    assert jobs.submit("metrics", {"stream": "IAM"}, lambda: None) is first
+
+
+def test_failed_job_reports_the_error_and_is_resubmitted():
+    def fail():
+        raise RuntimeError("Jira is down")
+
+    job = jobs.submit("risk", {"stream": "IAM"}, fail)
+    state = wait_finished(job)
+    assert state["status"] == jobs.FAILED
+    assert state["error"] == "Jira is down"
+    assert "result" not in state
+    assert jobs.submit("risk", {"stream": "IAM"}, lambda: None) is not job
+
+
+def test_progress_is_recorded_for_the_running_job():
+    def compute():
+        jobs.record("jira_pages")
+        jobs.record("jira_pages", 2)
+        jobs.record("llm_calls")
+        return "ok"
+
+    state = wait_finished(jobs.submit("updates", {"stream": "IAM"}, compute))
+    assert state["progress"] == {"jira_pages": 3, "changelogs": 0, "streams": 0, "llm_calls": 1}
+
+
+def test_record_outside_a_job_is_ignored():
+    jobs.record("jira_pages")
+
+
+def test_finished_jobs_are_pruned(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_MAX_RETAINED", 2)
+    finished = [wait_finished(jobs.submit("metrics", {"n": n}, lambda: None)) for n in range(3)]
+    assert jobs.get(finished[0]["job_id"]) is None
+    assert jobs.get(finished[2]["job_id"]) is not None
+
+    monkeypatch.setattr(jobs, "JOB_RETENTION_SECONDS", 0)
+    time.sleep(0.01)
+    assert jobs.get(finished[2]["job_id"]) is None
@@ -0,0 +1,125 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+import llm_executor
+import telemetry
+from circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+from llm_executor import LLMExecutor, LLMQueueTimeoutError, LLMTimeoutError
+
+
+def connection_error():
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+class FakeClient:
+    # Streams the answer word by word after a delay; each call takes the next
+    # entry of outcomes (an exception to raise or a delay in seconds), then 0
+    def __init__(self, answer="hello world", outcomes=()):
+        self.answer = answer
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def with_options(self, **options):
+        return self
+
+    def create(self, stream, stream_options, **request):
+        with self.lock:
+            self.calls += 1
+            outcome = self.outcomes.pop(0) if self.outcomes else 0
+        if isinstance(outcome, Exception):
+            raise outcome
+        return self.chunks(outcome)
+
+    def chunks(self, delay):
+        time.sleep(delay)
+        for word in self.answer.split(" "):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))], usage=None)
+        yield SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=7, completion_tokens=2))
+
+
+def complete(executor):
+    return executor.complete([{"role": "user", "content": "hi"}], "test-model", endpoint="test")
+
+
+def test_complete_joins_streamed_tokens_and_counts_usage():
+    client = FakeClient()
+    before = telemetry.openai_tokens.values.get(("test", "test-model", "prompt"), 0)
+    assert complete(LLMExecutor(lambda: client)) == "hello world"
+    assert telemetry.openai_tokens.values[("test", "test-model", "prompt")] == before + 7
+
+
+def test_client_is_created_on_first_call():
+    created = []
+    executor = LLMExecutor(lambda: created.append(1) or FakeClient())
+    assert created == []
+    complete(executor)
+    complete(executor)
+    assert created == [1]
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(llm_executor.random, "random", lambda: 0)
+    client = FakeClient(outcomes=[connection_error()])
+    assert complete(LLMExecutor(lambda: client, max_retries=1)) == "hello world"
+    assert client.calls == 2
+
+
+def test_slow_call_exceeds_deadline():
+    client = FakeClient(outcomes=[1.0])
+    with pytest.raises(LLMTimeoutError):
+        complete(LLMExecutor(lambda: client, deadline=0.1))
+
+
+def test_hedge_answers_when_first_attempt_is_slow():
+    client = FakeClient(outcomes=[2.0, 0])
+    executor = LLMExecutor(lambda: client, max_concurrency=2, hedge=True, hedge_after=0.05)
+    started = time.monotonic()
+    assert complete(executor) == "hello world"
+    assert time.monotonic() - started < 1.0
+    assert client.calls == 2
+
+
+def test_repeated_upstream_failures_open_the_breaker():
+    client = FakeClient(outcomes=[connection_error(), connection_error()])
+    executor = LLMExecutor(lambda: client, max_retries=0)
+    executor.breaker = CircuitBreaker("OpenAI", failure_threshold=2, reset_timeout=30)
+    for _ in range(2):
+        with pytest.raises(openai.APIConnectionError):
+            complete(executor)
+    with pytest.raises(CircuitOpenError):
+        complete(executor)
+    assert client.calls == 2
+
+
+def test_waiting_for_a_slot_does_not_count_against_openai():
+    # One slot, eight callers and a 0.5s deadline: the call that gets the slot
+    # overruns at OpenAI, the other seven only ever wait in our own queue
+    client = FakeClient(outcomes=[0.6] * 8)
+    executor = LLMExecutor(lambda: client, max_concurrency=1, deadline=0.5, max_retries=0)
+    executor.breaker = CircuitBreaker("OpenAI", failure_threshold=2, reset_timeout=30)
+    errors = []
+
+    def call():
+        try:
+            complete(executor)
+        except Exception as e:
+            errors.append(type(e))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(errors, key=lambda error: error.__name__) == [LLMQueueTimeoutError] * 7 + [LLMTimeoutError]
+    assert client.calls == 1
+    assert executor.breaker.state == CLOSED
+    client.outcomes = []
+    assert complete(executor) == "hello world"
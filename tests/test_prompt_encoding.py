@@ -0,0 +1,51 @@
+import backend
+
+
+def issue(key, **overrides):
+    fields = {
+        "IssueId": key,
+        "Summary": "Rotate keys",
+        "Product": "PingOne",
+        "Track": "Security",
+        "On_Track_Comment": "Waiting on QA",
+        "OnTrack_Status": "Green",
+        "Release_Type": "GA",
+        # Extracted but not sent to the model
+        "Status": "In Progress",
+        "Aha_Release": "2025.3",
+    }
+    fields.update(overrides)
+    return fields
+
+
+def test_values_stay_on_one_line():
+    assert backend.format_prompt_value(None) == ""
+    assert backend.format_prompt_value("  Waiting\non\tQA  ") == "Waiting on QA"
+    assert backend.format_prompt_value("Web|Mobile") == "Web/Mobile"
+    assert backend.format_prompt_value(3) == "3"
+
+
+def test_header_then_one_row_per_issue():
+    text = backend.create_custom_issue_string_for_prompt("IAM", [
+        issue("IAM-1"),
+        issue("IAM-2", Summary="Split | merge\nflows", Track=None),
+    ])
+    assert text == (
+        "IAM:\n"
+        "\n"
+        "IssueId|Summary|Product|Track|On_Track_Comment|OnTrack_Status|Release_Type\n"
+        "IAM-1|Rotate keys|PingOne|Security|Waiting on QA|Green|GA\n"
+        "IAM-2|Split / merge flows|PingOne||Waiting on QA|Green|GA\n"
+        "\n"
+    )
+
+
+def test_every_row_has_one_cell_per_column():
+    text = backend.create_custom_issue_string_for_prompt("IAM", [issue("IAM-1", On_Track_Comment="a|b|c")])
+    rows = text.strip().split("\n")[2:]
+    assert {len(row.split("|")) for row in rows} == {len(backend.PROMPT_ISSUE_FIELDS)}
+
+
+def test_stream_without_issues():
+    assert backend.create_custom_issue_string_for_prompt("IAM", []) == \
+        "IAM:\n\nIssueId|Summary|Product|Track|On_Track_Comment|OnTrack_Status|Release_Type\n\n"
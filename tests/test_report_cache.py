@@ -0,0 +1,81 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import report_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    report_cache._entries.clear()
+    yield
+    report_cache._entries.clear()
+
+
+def test_etag_depends_only_on_key_and_content():
+    key = ("metrics", "All", "2025-01-01", "2025-03-31")
+    report_cache.put(key, {"b": [1, 2], "a": "x"})
+    first = report_cache.peek(key)[0]
+
+    # Same content computed elsewhere (another worker, after a restart) has the same ETag
+    report_cache._entries.clear()
+    report_cache.put(key, {"a": "x", "b": [1, 2]})
+    assert report_cache.peek(key)[0] == first
+
+    report_cache.put(key, {"a": "x", "b": [1, 3]})
+    assert report_cache.peek(key)[0] != first
+    report_cache.put(("metrics", "AIC", "2025-01-01", "2025-03-31"), {"a": "x", "b": [1, 2]})
+    assert report_cache.peek(("metrics", "AIC", "2025-01-01", "2025-03-31"))[0] != first
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(report_cache, "REPORT_CACHE_MAX_ENTRIES", 2)
+    report_cache.put("a", 1)
+    report_cache.put("b", 2)
+    assert report_cache.get("a") == 1
+    report_cache.put("c", 3)
+    assert list(report_cache._entries) == ["a", "c"]
+
+
+def test_entries_past_max_stale_are_dropped():
+    report_cache.put("old", 1)
+    value, stored_at, version = report_cache._entries["old"]
+    report_cache._entries["old"] = (value, stored_at - report_cache.REPORT_CACHE_MAX_STALE_SECONDS - 1, version)
+    report_cache.put("new", 2)
+    assert list(report_cache._entries) == ["new"]
+
+
+def backdate(key, seconds):
+    value, stored_at, version = report_cache._entries[key]
+    report_cache._entries[key] = (value, stored_at - seconds, version)
+
+
+def test_result_built_from_cached_parts_is_as_old_as_the_oldest_part():
+    report_cache.put("part a", 1)
+    report_cache.put("part b", 2)
+    backdate("part a", 100)
+
+    # Parts read on pool threads count as long as the context is carried over
+    with ThreadPoolExecutor() as pool:
+        def compute():
+            parts = [pool.submit(contextvars.copy_context().run, report_cache.get, key) for key in ("part a", "part b")]
+            return sum(part.result() for part in parts)
+        value, age, status, _ = report_cache.serve("all", compute)
+
+    assert (value, status) == (3, report_cache.MISS)
+    assert age >= 100
+    assert report_cache.peek("all")[1] >= 100
+
+
+def test_nested_refresh_counts_as_a_fresh_part():
+    report_cache.put("part", 1)
+    backdate("part", report_cache.REPORT_CACHE_TTL_SECONDS + 10)
+
+    def compute():
+        part = report_cache.get("part")
+        return part if part is not None else report_cache.refresh("part", lambda: 5)
+
+    assert report_cache.refresh("all", compute) == 5
+    assert report_cache.peek("part")[2] == report_cache.HIT
+    assert report_cache.peek("all")[1] < 5
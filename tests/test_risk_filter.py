@@ -0,0 +1,42 @@
+import pytest
+
+import backend
+import jira_client
+
+SELECT = {"type": "option", "custom": "com.atlassian.jira.plugin.system.customfieldtypes:select"}
+TEXT = {"type": "string", "custom": "com.atlassian.jira.plugin.system.customfieldtypes:textfield"}
+
+
+@pytest.fixture
+def field_values(monkeypatch):
+    monkeypatch.setattr(jira_client, "fetch_fields", lambda: [
+        {"id": "customfield_10241", "name": "On-Track", "schema": SELECT},
+        {"id": "customfield_11085", "name": "On-Track", "schema": TEXT},
+        {"id": "customfield_11404", "name": "On-Track (migrated)", "schema": SELECT},
+        {"id": "summary", "name": "Summary", "schema": {"type": "string", "system": "summary"}},
+    ])
+    return backend.risk_field_values()
+
+
+def issue(**values):
+    return {"key": "A-1", "fields": {field: {"value": value} for field, value in values.items()}}
+
+
+def test_fields_are_resolved_by_name_and_type(field_values):
+    assert field_values == {
+        "customfield_10241": {"Yellow", "Red"},
+        "customfield_11404": {"Yellow (At-Risk)", "Red (Delayed)"},
+    }
+
+
+def test_each_field_only_accepts_its_own_values(field_values):
+    assert backend.is_at_risk(issue(customfield_10241="Yellow"), field_values)
+    assert backend.is_at_risk(issue(customfield_11404="Red (Delayed)"), field_values)
+    assert not backend.is_at_risk(issue(customfield_10241="Red (Delayed)"), field_values)
+    assert not backend.is_at_risk(issue(customfield_11404="Yellow"), field_values)
+
+
+def test_fields_outside_the_query_are_ignored(field_values):
+    # A text field named On-Track is not the Dropdown the query filters on
+    assert not backend.is_at_risk(issue(customfield_11085="Red"), field_values)
+    assert not backend.is_at_risk(issue(customfield_10241="Green", customfield_11404=None), field_values)
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from scheduler import INTERACTIVE, SYNC, WARMUP, PriorityGate
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_free_slot_goes_to_highest_waiting_class():
+    gate = PriorityGate("test", 1)
+    assert gate.acquire(SYNC)
+    order = []
+
+    def waiter(cls):
+        gate.acquire(cls)
+        order.append(cls)
+        gate.release(cls)
+
+    threads = []
+    for cls in (SYNC, WARMUP, INTERACTIVE):
+        thread = threading.Thread(target=waiter, args=(cls,))
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: gate.stats()["classes"][cls]["queued"] == 1)
+
+    gate.release(SYNC)
+    for thread in threads:
+        thread.join(5)
+    assert order == [INTERACTIVE, WARMUP, SYNC]
+    assert gate.stats()["available"] == 1
+
+
+def test_acquire_times_out_without_a_slot():
+    gate = PriorityGate("test", 1)
+    with gate.slot(INTERACTIVE):
+        assert gate.acquire(INTERACTIVE, timeout=0.01) is False
+        assert gate.stats()["classes"][INTERACTIVE]["queued"] == 0
+    assert gate.acquire(INTERACTIVE, timeout=0.01) is True
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+import shared_cache
+from shared_cache import MemoryBackend, SQLiteBackend, TieredCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(shared_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return SQLiteBackend(str(tmp_path / "shared.sqlite3"))
+
+
+def test_put_then_get(backend, clock):
+    cache = TieredCache("pages", ttl=60, backend=backend)
+    assert cache.get("k") is None
+    cache.put("k", {"issues": [1, 2], "total": 2})
+    assert cache.get("k") == {"issues": [1, 2], "total": 2}
+
+
+def test_other_workers_hit_the_shared_tier(backend, clock):
+    # Two caches on one backend stand in for two uvicorn workers
+    first = TieredCache("pages", ttl=60, backend=backend)
+    second = TieredCache("pages", ttl=60, backend=backend)
+    first.put("k", ["a"])
+    assert "k" not in second.local
+    assert second.get("k") == ["a"]
+    assert second.local["k"] == (["a"], 1000.0)
+
+
+def test_namespaces_are_separate(backend, clock):
+    TieredCache("pages", backend=backend).put("k", 1)
+    assert TieredCache("summaries", backend=backend).get("k") is None
+
+
+def test_entries_expire_in_both_tiers(backend, clock):
+    cache = TieredCache("pages", ttl=60, backend=backend)
+    cache.put("k", 1)
+    clock.now += 30
+    # A copy fetched from the shared tier keeps the original timestamp
+    other = TieredCache("pages", ttl=60, backend=backend)
+    assert other.get("k") == 1
+    clock.now += 31
+    assert cache.get("k") is None
+    assert other.get("k") is None
+
+
+def test_local_tier_keeps_recently_used_entries(clock):
+    cache = TieredCache("pages", local_entries=2, backend=MemoryBackend())
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert list(cache.local) == ["a", "c"]
+    # Evicted locally, still shared
+    assert cache.get("b") == 2
+
+
+def test_prune_drops_expired_and_oldest_entries(backend, clock):
+    for n in range(5):
+        clock.now += 10
+        backend.put("pages", f"k{n}", n, clock.now)
+    backend.put("summaries", "k0", "kept", clock.now)
+    clock.now += 25
+    backend.prune("pages", max_entries=3, ttl=50)
+
+    assert [backend.get("pages", f"k{n}") is not None for n in range(5)] == [False, False, True, True, True]
+    assert backend.get("summaries", "k0") == ("kept", 1050.0)
+    backend.prune("pages", max_entries=1, ttl=None)
+    assert [backend.get("pages", f"k{n}") is not None for n in range(5)] == [False, False, False, False, True]
+
+
+def test_puts_prune_the_shared_tier(monkeypatch, clock):
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_PRUNE_EVERY", 3)
+    backend = MemoryBackend()
+    cache = TieredCache("pages", max_entries=2, backend=backend)
+    for n in range(3):
+        clock.now += 1
+        cache.put(f"k{n}", n)
+    assert sorted(key for _, key in backend.entries) == ["k1", "k2"]
+
+
+def test_unreadable_shared_tier_is_a_miss(tmp_path, clock):
+    # A directory cannot be opened as a database
+    cache = TieredCache("pages", backend=SQLiteBackend(str(tmp_path)))
+    cache.put("k", 1)
+    cache.local.clear()
+    assert cache.get("k") is None
@@ -0,0 +1,71 @@
+from window_cache import WindowCache, resolution_minute, to_minute
+
+ISSUES = [
+    ("2025-01-05T10:00:00.000+0000", "E-1", "one"),
+    ("2025-01-20T10:00:00.000+0000", "E-2", "two"),
+    ("2025-02-10T10:00:00.000+0000", "E-3", "three"),
+]
+
+
+def fetcher(issues, calls):
+    def fetch(start, end):
+        calls.append((start, end))
+        first, last = to_minute(start), to_minute(end)
+        return [issue for issue in issues if first <= resolution_minute(issue[0]) < last]
+    return fetch
+
+
+def test_missing_returns_uncovered_gaps():
+    cache = WindowCache()
+    segments = [[10, 20, [], 0], [30, 40, [], 0]]
+    assert cache.missing(segments, 0, 50) == [(0, 10), (20, 30), (40, 50)]
+    assert cache.missing(segments, 12, 35) == [(20, 30)]
+    assert cache.missing(segments, 10, 20) == []
+    assert cache.missing([], 5, 8) == [(5, 8)]
+
+
+def test_insert_splits_overlapped_segments():
+    cache = WindowCache()
+    cache.insert("k", 0, 100, [(5, "A", 1), (50, "B", 2), (95, "C", 3)], 1.0)
+    cache.insert("k", 40, 60, [(45, "D", 4)], 2.0)
+    assert cache.segments["k"] == [
+        [0, 40, [(5, "A", 1)], 1.0],
+        [40, 60, [(45, "D", 4)], 2.0],
+        [60, 100, [(95, "C", 3)], 1.0],
+    ]
+
+
+def test_query_only_fetches_uncovered_part_of_window():
+    cache = WindowCache()
+    calls = []
+    fetch = fetcher(ISSUES, calls)
+
+    assert sorted(cache.query("k", "2025-01-01 00:00", "2025-02-01 00:00", fetch)) == ["one", "two"]
+    assert calls == [("2025-01-01 00:00", "2025-02-01 00:00")]
+
+    # Sliding the window only fetches the new part
+    assert sorted(cache.query("k", "2025-01-15 00:00", "2025-02-15 00:00", fetch)) == ["three", "two"]
+    assert calls[1:] == [("2025-02-01 00:00", "2025-02-15 00:00")]
+
+    # A covered window costs no fetch
+    assert sorted(cache.query("k", "2025-01-01 00:00", "2025-02-15 00:00", fetch)) == ["one", "three", "two"]
+    assert len(calls) == 2
+
+
+def test_query_refetches_expired_segments():
+    cache = WindowCache(ttl=-1)
+    calls = []
+    fetch = fetcher(ISSUES, calls)
+    cache.query("k", "2025-01-01 00:00", "2025-02-01 00:00", fetch)
+    cache.query("k", "2025-01-01 00:00", "2025-02-01 00:00", fetch)
+    assert len(calls) == 2
+
+
+def test_query_keeps_newest_copy_of_reresolved_issue():
+    cache = WindowCache()
+    cache.query("k", "2025-01-01 00:00", "2025-02-01 00:00", fetcher(ISSUES, []))
+
+    moved = ISSUES[:1] + [("2025-02-05T10:00:00.000+0000", "E-2", "two again")] + ISSUES[2:]
+    cache.query("k", "2025-02-01 00:00", "2025-03-01 00:00", fetcher(moved, []))
+
+    assert sorted(cache.query("k", "2025-01-01 00:00", "2025-03-01 00:00", fetcher(moved, []))) == ["one", "three", "two again"]
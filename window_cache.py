@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import telemetry
+
+# Epics cached by resolution-date interval, per query. A request for a window
+# only fetches the sub-intervals no cached segment covers, so widening or
+# sliding a window costs roughly the size of the change.
+WINDOW_CACHE_TTL_SECONDS = float(os.getenv("WINDOW_CACHE_TTL_SECONDS", "3600"))
+# JQL dates are read in the Jira user's profile time zone; resolution
+# timestamps are converted to it before they are compared with a window
+JIRA_TIMEZONE = ZoneInfo(os.getenv("JIRA_TIMEZONE", "UTC"))
+
+MINUTE_FORMAT = "%Y-%m-%d %H:%M"
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_minute(text):
+    # "2024-10-01 00:00" -> minutes since 1970-01-01 on the Jira clock
+    return int((datetime.strptime(text, MINUTE_FORMAT) - EPOCH).total_seconds() // 60)
+
+
+def format_minute(minute):
+    return (EPOCH + timedelta(minutes=minute)).strftime(MINUTE_FORMAT)
+
+
+def resolution_minute(timestamp):
+    # "2024-10-05T10:00:00.000-0700" -> minute of that instant on the Jira clock
+    if not timestamp:
+        return None
+    resolved = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z").astimezone(JIRA_TIMEZONE)
+    return int((resolved.replace(tzinfo=None) - EPOCH).total_seconds() // 60)
+
+
+class WindowCache:
+    def __init__(self, ttl=WINDOW_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # key -> sorted, disjoint [start, end, items, fetched_at] with half-open
+        # minute bounds; items are (minute, issue_key, value)
+        self.segments = {}
+
+    def missing(self, segments, start, end):
+        gaps = []
+        cursor = start
+        for seg_start, seg_end, _, _ in segments:
+            if seg_end <= cursor or seg_start >= end:
+                continue
+            if seg_start > cursor:
+                gaps.append((cursor, seg_start))
+            cursor = max(cursor, seg_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def insert(self, key, start, end, items, fetched_at):
+        # The new segment wins wherever it overlaps one fetched concurrently
+        kept = []
+        for seg_start, seg_end, seg_items, seg_fetched in self.segments.get(key, []):
+            if seg_end <= start or seg_start >= end:
+                kept.append([seg_start, seg_end, seg_items, seg_fetched])
+                continue
+            if seg_start < start:
+                kept.append([seg_start, start, [item for item in seg_items if item[0] is None or item[0] < start], seg_fetched])
+            if seg_end > end:
+                kept.append([end, seg_end, [item for item in seg_items if item[0] is not None and item[0] >= end], seg_fetched])
+        kept.append([start, end, items, fetched_at])
+        kept.sort(key=lambda segment: segment[0])
+        self.segments[key] = kept
+
+    def query(self, key, start, end, fetch):
+        # fetch(start_text, end_text) returns [(resolutiondate, issue_key, value)]
+        # for everything resolved in [start, end) on the Jira clock
+        start = to_minute(start)
+        end = to_minute(end)
+        now = time.time()
+
+        with self.lock:
+            segments = [segment for segment in self.segments.get(key, []) if now - segment[3] <= self.ttl]
+            self.segments[key] = segments
+            gaps = self.missing(segments, start, end)
+        telemetry.cache_requests.inc("epic_windows", "miss" if gaps else "hit")
+
+        for gap_start, gap_end in gaps:
+            fetched_at = time.time()
+            items = [
+                (resolution_minute(resolved), issue_key, value)
+                for resolved, issue_key, value in fetch(format_minute(gap_start), format_minute(gap_end))
+            ]
+            with self.lock:
+                self.insert(key, gap_start, gap_end, items, fetched_at)
+
+        # Segments fully inside the window are taken whole; partial ones are cut
+        # by resolution minute. An issue re-resolved since an older segment was
+        # fetched only keeps its newest copy.
+        with self.lock:
+            segments = list(self.segments.get(key, []))
+        newest = {}
+        for seg_start, seg_end, items, fetched_at in segments:
+            if seg_end <= start or seg_start >= end:
+                continue
+            whole = start <= seg_start and seg_end <= end
+            for minute, issue_key, value in items:
+                if whole or (minute is not None and start <= minute < end):
+                    if issue_key not in newest or newest[issue_key][0] <= fetched_at:
+                        newest[issue_key] = (fetched_at, value)
+        return [value for _, value in newest.values()]
+
+
+# Resolved epics for /metrics, keyed by the stream's JQL without its date conditions
+epic_windows = WindowCache()